@@ -0,0 +1,14 @@
+import importlib
+
+# Submodules (and their dependencies) are only imported on first attribute access, e.g. `beforerr.polars`
+__all__ = ["basics", "core", "io", "matplotlib", "polars", "project", "r", "tplot"]
+
+
+def __getattr__(name: str):
+    if name in __all__:
+        return importlib.import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -5,31 +5,117 @@ d = { 'settings': { 'branch': 'main',
                 'doc_host': 'https://Beforerr.github.io',
                 'git_url': 'https://github.com/Beforerr/beforerr_dev',
                 'lib_path': 'src/beforerr'},
-  'syms': { 'beforerr.basics': {'beforerr.basics.pmap': ('basics.html#pmap', 'beforerr/basics.py')},
-            'beforerr.core': {'beforerr.core.ifnone': ('core.html#ifnone', 'beforerr/core.py')},
+  'syms': { 'beforerr.basics': { 'beforerr.basics._apply': ('basics.html#_apply', 'beforerr/basics.py'),
+                                 'beforerr.basics._chunks': ('basics.html#_chunks', 'beforerr/basics.py'),
+                                 'beforerr.basics._parallel_map': ('basics.html#_parallel_map', 'beforerr/basics.py'),
+                                 'beforerr.basics.pmap': ('basics.html#pmap', 'beforerr/basics.py'),
+                                 'beforerr.basics.process_pmap': ('basics.html#process_pmap', 'beforerr/basics.py'),
+                                 'beforerr.basics.thread_pmap': ('basics.html#thread_pmap', 'beforerr/basics.py')},
+            'beforerr.core': { 'beforerr.core.SpanSummary': ('core.html#spansummary', 'beforerr/core.py'),
+                               'beforerr.core.SpanSummary.__call__': ('core.html#spansummary.__call__', 'beforerr/core.py'),
+                               'beforerr.core.SpanSummary.__init__': ('core.html#spansummary.__init__', 'beforerr/core.py'),
+                               'beforerr.core.SpanSummary.__rich__': ('core.html#spansummary.__rich__', 'beforerr/core.py'),
+                               'beforerr.core.SpanSummary.print': ('core.html#spansummary.print', 'beforerr/core.py'),
+                               'beforerr.core.SpanSummary.stats': ('core.html#spansummary.stats', 'beforerr/core.py'),
+                               'beforerr.core.SpanSummary.table': ('core.html#spansummary.table', 'beforerr/core.py'),
+                               'beforerr.core.ifnone': ('core.html#ifnone', 'beforerr/core.py'),
+                               'beforerr.core.instrument': ('core.html#instrument', 'beforerr/core.py'),
+                               'beforerr.core.instrumented': ('core.html#instrumented', 'beforerr/core.py'),
+                               'beforerr.core.log_span': ('core.html#log_span', 'beforerr/core.py'),
+                               'beforerr.core.span': ('core.html#span', 'beforerr/core.py')},
             'beforerr.io.arrow_ipc': {},
             'beforerr.io.json': {},
+            'beforerr.io.parquet': {},
             'beforerr.io.pickle': {},
             'beforerr.io.polars': {},
-            'beforerr.polars': { 'beforerr.polars.convert_to_pd_dataframe': ('polars.html#convert_to_pd_dataframe', 'beforerr/polars.py'),
+            'beforerr.polars': { 'beforerr.polars.VectorExpr': ('polars.html#vectorexpr', 'beforerr/polars.py'),
+                                 'beforerr.polars.VectorExpr.__init__': ('polars.html#vectorexpr.__init__', 'beforerr/polars.py'),
+                                 'beforerr.polars.VectorExpr.components': ('polars.html#vectorexpr.components', 'beforerr/polars.py'),
+                                 'beforerr.polars.VectorExpr.cross': ('polars.html#vectorexpr.cross', 'beforerr/polars.py'),
+                                 'beforerr.polars.VectorExpr.dot': ('polars.html#vectorexpr.dot', 'beforerr/polars.py'),
+                                 'beforerr.polars.VectorExpr.norm': ('polars.html#vectorexpr.norm', 'beforerr/polars.py'),
+                                 'beforerr.polars.VectorExpr.proj': ('polars.html#vectorexpr.proj', 'beforerr/polars.py'),
+                                 'beforerr.polars.VectorExpr.rotate': ('polars.html#vectorexpr.rotate', 'beforerr/polars.py'),
+                                 'beforerr.polars.VectorExpr.unit': ('polars.html#vectorexpr.unit', 'beforerr/polars.py'),
+                                 'beforerr.polars._vec': ('polars.html#_vec', 'beforerr/polars.py'),
+                                 'beforerr.polars.build_pyramid': ('polars.html#build_pyramid', 'beforerr/polars.py'),
+                                 'beforerr.polars.convert_to_pd_dataframe': ('polars.html#convert_to_pd_dataframe', 'beforerr/polars.py'),
                                  'beforerr.polars.decompose_vector': ('polars.html#decompose_vector', 'beforerr/polars.py'),
+                                 'beforerr.polars.duration': ('polars.html#duration', 'beforerr/polars.py'),
                                  'beforerr.polars.expand_collections': ('polars.html#expand_collections', 'beforerr/polars.py'),
                                  'beforerr.polars.filter_df_by_ranges': ('polars.html#filter_df_by_ranges', 'beforerr/polars.py'),
+                                 'beforerr.polars.filter_lf_by_ranges': ('polars.html#filter_lf_by_ranges', 'beforerr/polars.py'),
                                  'beforerr.polars.filter_series_by_ranges_i': ( 'polars.html#filter_series_by_ranges_i',
                                                                                 'beforerr/polars.py'),
                                  'beforerr.polars.format_time': ('polars.html#format_time', 'beforerr/polars.py'),
+                                 'beforerr.polars.iter_pd_dataframes': ('polars.html#iter_pd_dataframes', 'beforerr/polars.py'),
+                                 'beforerr.polars.merge_ranges': ('polars.html#merge_ranges', 'beforerr/polars.py'),
                                  'beforerr.polars.pl_norm': ('polars.html#pl_norm', 'beforerr/polars.py'),
+                                 'beforerr.polars.ranges_index': ('polars.html#ranges_index', 'beforerr/polars.py'),
+                                 'beforerr.polars.resample': ('polars.html#resample', 'beforerr/polars.py'),
+                                 'beforerr.polars.scan_pyramid': ('polars.html#scan_pyramid', 'beforerr/polars.py'),
                                  'beforerr.polars.sort': ('polars.html#sort', 'beforerr/polars.py')},
-            'beforerr.project': { 'beforerr.project.append_prefix_suffix': ('projects.html#append_prefix_suffix', 'beforerr/project.py'),
+            'beforerr.project': { 'beforerr.project.CacheEntry': ('projects.html#cacheentry', 'beforerr/project.py'),
+                                  'beforerr.project.DiskCache': ('projects.html#diskcache', 'beforerr/project.py'),
+                                  'beforerr.project.DiskCache.evict': ('projects.html#diskcache.evict', 'beforerr/project.py'),
+                                  'beforerr.project.DiskCache.manifest': ('projects.html#diskcache.manifest', 'beforerr/project.py'),
+                                  'beforerr.project.DiskCache.model_post_init': ( 'projects.html#diskcache.model_post_init',
+                                                                                  'beforerr/project.py'),
+                                  'beforerr.project.DiskCache.produce_or_load': ( 'projects.html#diskcache.produce_or_load',
+                                                                                  'beforerr/project.py'),
+                                  'beforerr.project.DiskCache.save_manifest': ( 'projects.html#diskcache.save_manifest',
+                                                                                'beforerr/project.py'),
+                                  'beforerr.project.DiskCache.size': ('projects.html#diskcache.size', 'beforerr/project.py'),
+                                  'beforerr.project.DiskCache.stats': ('projects.html#diskcache.stats', 'beforerr/project.py'),
+                                  'beforerr.project.MemoryCache': ('projects.html#memorycache', 'beforerr/project.py'),
+                                  'beforerr.project.MemoryCache.clear': ('projects.html#memorycache.clear', 'beforerr/project.py'),
+                                  'beforerr.project.MemoryCache.load': ('projects.html#memorycache.load', 'beforerr/project.py'),
+                                  'beforerr.project.MemoryCache.put': ('projects.html#memorycache.put', 'beforerr/project.py'),
+                                  'beforerr.project.MemoryCache.size': ('projects.html#memorycache.size', 'beforerr/project.py'),
+                                  'beforerr.project.MemoryCache.stats': ('projects.html#memorycache.stats', 'beforerr/project.py'),
+                                  'beforerr.project.SavenameFormatter': ('projects.html#savenameformatter', 'beforerr/project.py'),
+                                  'beforerr.project.SavenameFormatter.__call__': ( 'projects.html#savenameformatter.__call__',
+                                                                                   'beforerr/project.py'),
+                                  'beforerr.project.SavenameFormatter.__init__': ( 'projects.html#savenameformatter.__init__',
+                                                                                   'beforerr/project.py'),
+                                  'beforerr.project.SavenameFormatter.converter': ( 'projects.html#savenameformatter.converter',
+                                                                                    'beforerr/project.py'),
+                                  'beforerr.project.SavenameFormatter.labels': ( 'projects.html#savenameformatter.labels',
+                                                                                 'beforerr/project.py'),
+                                  'beforerr.project.SavenameFormatter.many': ( 'projects.html#savenameformatter.many',
+                                                                               'beforerr/project.py'),
+                                  'beforerr.project.SavenameFormatter.part': ( 'projects.html#savenameformatter.part',
+                                                                               'beforerr/project.py'),
+                                  'beforerr.project._dir_kwargs': ('projects.html#_dir_kwargs', 'beforerr/project.py'),
+                                  'beforerr.project._formatter': ('projects.html#_formatter', 'beforerr/project.py'),
+                                  'beforerr.project._hashable': ('projects.html#_hashable', 'beforerr/project.py'),
+                                  'beforerr.project._produce_or_load_task': ('projects.html#_produce_or_load_task', 'beforerr/project.py'),
+                                  'beforerr.project._qualname': ('projects.html#_qualname', 'beforerr/project.py'),
+                                  'beforerr.project.append_prefix_suffix': ('projects.html#append_prefix_suffix', 'beforerr/project.py'),
+                                  'beforerr.project.atomic_save': ('projects.html#atomic_save', 'beforerr/project.py'),
+                                  'beforerr.project.backups': ('projects.html#backups', 'beforerr/project.py'),
+                                  'beforerr.project.build_catalog': ('projects.html#build_catalog', 'beforerr/project.py'),
+                                  'beforerr.project.config_hash': ('projects.html#config_hash', 'beforerr/project.py'),
                                   'beforerr.project.datadir': ('projects.html#datadir', 'beforerr/project.py'),
-                                  'beforerr.project.increment_backup_num': ('projects.html#increment_backup_num', 'beforerr/project.py'),
+                                  'beforerr.project.file_lock': ('projects.html#file_lock', 'beforerr/project.py'),
+                                  'beforerr.project.fsync': ('projects.html#fsync', 'beforerr/project.py'),
+                                  'beforerr.project.move': ('projects.html#move', 'beforerr/project.py'),
+                                  'beforerr.project.parse_savename': ('projects.html#parse_savename', 'beforerr/project.py'),
                                   'beforerr.project.plotsdir': ('projects.html#plotsdir', 'beforerr/project.py'),
                                   'beforerr.project.produce_or_load': ('projects.html#produce_or_load', 'beforerr/project.py'),
                                   'beforerr.project.produce_or_load_file': ('projects.html#produce_or_load_file', 'beforerr/project.py'),
+                                  'beforerr.project.produce_or_load_many': ('projects.html#produce_or_load_many', 'beforerr/project.py'),
                                   'beforerr.project.projectdir': ('projects.html#projectdir', 'beforerr/project.py'),
                                   'beforerr.project.safesave': ('projects.html#safesave', 'beforerr/project.py'),
                                   'beforerr.project.savename': ('projects.html#savename', 'beforerr/project.py'),
+                                  'beforerr.project.savenames': ('projects.html#savenames', 'beforerr/project.py'),
                                   'beforerr.project.setup_run_dir': ('projects.html#setup_run_dir', 'beforerr/project.py'),
+                                  'beforerr.project.share': ('projects.html#share', 'beforerr/project.py'),
+                                  'beforerr.project.sizeof': ('projects.html#sizeof', 'beforerr/project.py'),
+                                  'beforerr.project.stringtoval': ('projects.html#stringtoval', 'beforerr/project.py'),
                                   'beforerr.project.valtostring': ('projects.html#valtostring', 'beforerr/project.py')},
-            'beforerr.r': {'beforerr.r.py2rpy_polars': ('r.html#py2rpy_polars', 'beforerr/r.py')},
+            'beforerr.r': { 'beforerr.r._rarrow': ('r.html#_rarrow', 'beforerr/r.py'),
+                            'beforerr.r.polars_to_r': ('r.html#polars_to_r', 'beforerr/r.py'),
+                            'beforerr.r.py2rpy_polars': ('r.html#py2rpy_polars', 'beforerr/r.py'),
+                            'beforerr.r.r_to_polars': ('r.html#r_to_polars', 'beforerr/r.py')},
             'beforerr.tplot': {}}}
@@ -1,11 +1,21 @@
 # AUTOGENERATED! DO NOT EDIT! File to edit: ../../nbs/01_basics.ipynb.
 
 # %% auto 0
-__all__ = ['pmap']
+__all__ = ['pmap', 'thread_pmap', 'process_pmap']
 
 # %% ../../nbs/01_basics.ipynb 2
-from pipe import select
+import os
+from pipe import Pipe, select
 from functools import partial
+from collections import deque
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from itertools import islice
 
 # %% ../../nbs/01_basics.ipynb 3
 def pmap(func, *args, **kwargs):
@@ -13,3 +23,94 @@ def pmap(func, *args, **kwargs):
     map with `partial`
     """
     return select(partial(func, *args, **kwargs))
+
+# %% ../../nbs/01_basics.ipynb 5
+def _chunks(iterable, size: int):
+    it = iter(iterable)
+    while chunk := list(islice(it, size)):
+        yield chunk
+
+
+def _apply(func, chunk: list) -> list:
+    return [func(item) for item in chunk]
+
+
+def _parallel_map(
+    iterable,
+    func,
+    executor: type[Executor],
+    max_workers: int = None,
+    chunksize: int = 1,
+    buffersize: int = None,  # maximum number of chunks in flight, defaults to twice the number of workers
+    ordered: bool = True,
+):
+    if max_workers is None:
+        # default number of workers of the executors
+        cpus = os.cpu_count() or 1
+        if executor is ThreadPoolExecutor:
+            max_workers = min(32, cpus + 4)
+        else:
+            max_workers = min(cpus, 61) if os.name == "nt" else cpus
+    pool = executor(max_workers)
+    buffersize = buffersize or 2 * max_workers
+    chunks = _chunks(iterable, chunksize)
+    pending = deque(pool.submit(_apply, func, c) for c in islice(chunks, buffersize))
+    try:
+        while pending:
+            if ordered:
+                done = [pending.popleft()]
+            else:
+                done, not_done = wait(pending, return_when=FIRST_COMPLETED)
+                pending = deque(not_done)
+            for future in done:
+                # refill before yielding, so the workers keep busy while results are consumed
+                chunk = next(chunks, None)
+                if chunk is not None:
+                    pending.append(pool.submit(_apply, func, chunk))
+                yield from future.result()
+    finally:
+        pool.shutdown(cancel_futures=True)
+
+
+def thread_pmap(
+    func,
+    *args,
+    max_workers: int = None,
+    chunksize: int = 1,
+    buffersize: int = None,
+    ordered: bool = True,
+    **kwargs,
+):
+    """
+    `pmap` on a thread pool, for I/O-bound functions
+    """
+    f = partial(func, *args, **kwargs)
+    options = dict(
+        max_workers=max_workers,
+        chunksize=chunksize,
+        buffersize=buffersize,
+        ordered=ordered,
+    )
+    return Pipe(_parallel_map)(f, ThreadPoolExecutor, **options)
+
+
+def process_pmap(
+    func,
+    *args,
+    max_workers: int = None,
+    chunksize: int = 1,
+    buffersize: int = None,
+    ordered: bool = True,
+    **kwargs,
+):
+    """
+    `pmap` on a process pool, for CPU-bound functions (`func` and the items must be picklable)
+    """
+    f = partial(func, *args, **kwargs)
+    options = dict(
+        max_workers=max_workers,
+        chunksize=chunksize,
+        buffersize=buffersize,
+        ordered=ordered,
+    )
+    return Pipe(_parallel_map)(f, ProcessPoolExecutor, **options)
@@ -1,9 +1,168 @@
 # AUTOGENERATED! DO NOT EDIT! File to edit: ../../nbs/00_core.ipynb.
 
 # %% auto 0
-__all__ = ['ifnone']
+__all__ = ['callbacks', 'profiling', 'ifnone', 'instrumented', 'span', 'log_span', 'SpanSummary', 'instrument']
 
 # %% ../../nbs/00_core.ipynb 2
+import time
+from contextlib import contextmanager
+from typing import Callable
+
+# %% ../../nbs/00_core.ipynb 3
 def ifnone(a, b):
     "`b` if `a` is None else `a`"
     return b if a is None else a
+
+# %% ../../nbs/00_core.ipynb 5
+callbacks: list[Callable[[dict], None]] = []  # called with the record of every span
+profiling = dict(cprofile=False, tracemalloc=False)
+
+
+def instrumented() -> bool:
+    "Whether spans are recorded, i.e. any callback is registered"
+    return bool(callbacks)
+
+
+@contextmanager
+def span(stage: str, profile: bool = False, **fields):
+    """
+    Time the block as a `stage` span.
+
+    The yielded record can be completed within the block, it is passed to the `callbacks` on exit with its `duration` (and `error` if any).
+    With `profile`, the block is also profiled if enabled in `profiling`: `cProfile` statistics are stored in `profile` (`pstats.Stats`), and the peak of memory allocated (`tracemalloc`) in `peak_memory` (in bytes).
+    """
+    record = dict(stage=stage, **fields)
+    if not callbacks:
+        yield record
+        return
+
+    profiler = None
+    if profile and profiling["cprofile"]:
+        import cProfile
+        import pstats
+
+        profiler = cProfile.Profile()
+    tracing = profile and profiling["tracemalloc"]
+    if tracing:
+        import tracemalloc
+
+        started = not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+
+    start = time.perf_counter()
+    if profiler is not None:
+        profiler.enable()
+    try:
+        yield record
+    except BaseException as e:
+        record["error"] = repr(e)
+        raise
+    finally:
+        record["duration"] = time.perf_counter() - start
+        if profiler is not None:
+            profiler.disable()
+            record["profile"] = pstats.Stats(profiler)
+        if tracing:
+            record["peak_memory"] = tracemalloc.get_traced_memory()[1]
+            if started:
+                tracemalloc.stop()
+        for callback in callbacks:
+            callback(record)
+
+# %% ../../nbs/00_core.ipynb 6
+def log_span(record: dict):
+    "Emit `record` as a structured `loguru` record (bound as `span`) at the `DEBUG` level"
+    from loguru import logger
+
+    logger.bind(span=record).debug(
+        "{stage} took {duration:.3f}s",
+        stage=record["stage"],
+        duration=record["duration"],
+    )
+
+
+class SpanSummary:
+    "Aggregate the records of spans by stage"
+
+    def __init__(self):
+        self.records = []
+
+    def __call__(self, record: dict):
+        self.records.append(record)
+
+    def stats(self) -> dict[str, dict]:
+        stats = {}
+        for record in self.records:
+            stage = stats.setdefault(
+                record["stage"],
+                dict(calls=0, total=0.0, max=0.0, bytes=0, hits=0, misses=0, errors=0),
+            )
+            stage["calls"] += 1
+            stage["total"] += record["duration"]
+            stage["max"] = max(stage["max"], record["duration"])
+            stage["bytes"] += record.get("bytes", 0)
+            if "hit" in record:
+                stage["hits" if record["hit"] else "misses"] += 1
+            stage["errors"] += "error" in record
+        return stats
+
+    def table(self):
+        "`rich` table of the `stats`, sorted by total time"
+        from rich.table import Table
+
+        table = Table(title="Spans")
+        table.add_column("stage")
+        for column in [
+            "calls",
+            "total (s)",
+            "mean (s)",
+            "max (s)",
+            "bytes",
+            "hits",
+            "misses",
+            "errors",
+        ]:
+            table.add_column(column, justify="right")
+        stats = sorted(self.stats().items(), key=lambda item: -item[1]["total"])
+        for stage, s in stats:
+            table.add_row(
+                stage,
+                str(s["calls"]),
+                f"{s['total']:.3f}",
+                f"{s['total'] / s['calls']:.3f}",
+                f"{s['max']:.3f}",
+                f"{s['bytes']:,}",
+                str(s["hits"]),
+                str(s["misses"]),
+                str(s["errors"]),
+            )
+        return table
+
+    def __rich__(self):
+        return self.table()
+
+    def print(self):
+        from rich.console import Console
+
+        Console().print(self.table())
+
+
+@contextmanager
+def instrument(
+    *funcs: Callable[[dict], None],  # additional callbacks, e.g. `log_span`
+    profile: bool = False,  # profile the producers with `cProfile`
+    trace_memory: bool = False,  # trace the memory allocated by the producers with `tracemalloc`
+):
+    "Record the spans within the block in the yielded `SpanSummary`"
+    summary = SpanSummary()
+    previous = profiling.copy()
+    profiling.update(cprofile=profile, tracemalloc=trace_memory)
+    callbacks.extend([summary, *funcs])
+    try:
+        yield summary
+    finally:
+        for func in [summary, *funcs]:
+            callbacks.remove(func)
+        profiling.update(previous)
@@ -1,23 +1,67 @@
 # AUTOGENERATED! DO NOT EDIT! File to edit: ../../../nbs/03_io.ipynb.
 
 # %% auto 0
-__all__ = ['load', 'save', 'action']
+__all__ = ['load', 'save', 'scan', 'aload', 'asave', 'register_format', 'open_replace', 'action', 'aaction', 'aload_many',
+           'load_many', 'RemoteCache', 'set_remote_cache', 'is_remote']
 
 # %% ../../../nbs/03_io.ipynb 1
-from intake.readers.datatypes import recommend, JSONFile, PickleFile, Feather2
+import hashlib
 import importlib
+import json
 import os
-from functools import partial
-from pydantic import validate_call
+import posixpath
+import sys
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import cache, partial
 from pathlib import Path
+from typing import TYPE_CHECKING
+
+from ..core import instrumented, span
+
+if TYPE_CHECKING:
+    from upath import UPath
 
 # %% ../../../nbs/03_io.ipynb 2
+# Backends of the `intake` datatypes (by name, so that `intake` is only imported when a datatype is guessed)
 maps = {
-    JSONFile: ["beforerr.io.json"],
-    PickleFile: ["beforerr.io.pickle"],
-    Feather2: ["beforerr.io.arrow_ipc"],
+    "JSONFile": ["beforerr.io.json"],
+    "PickleFile": ["beforerr.io.pickle"],
+    "Feather2": ["beforerr.io.arrow_ipc"],
+    "Parquet": ["beforerr.io.parquet"],
+}
+
+# Backends of known file suffixes, resolved without inspecting the file
+formats = {
+    ".json": "beforerr.io.json",
+    ".jsonl": "beforerr.io.json",
+    ".ndjson": "beforerr.io.json",
+    ".pickle": "beforerr.io.pickle",
+    ".pkl": "beforerr.io.pickle",
+    ".pkl.zst": "beforerr.io.pickle",
+    ".pkl.lz4": "beforerr.io.pickle",
+    ".pkl.gz": "beforerr.io.pickle",
+    ".pickle.zst": "beforerr.io.pickle",
+    ".pickle.lz4": "beforerr.io.pickle",
+    ".pickle.gz": "beforerr.io.pickle",
+    ".arrow": "beforerr.io.arrow_ipc",
+    ".ipc": "beforerr.io.arrow_ipc",
+    ".feather": "beforerr.io.arrow_ipc",
+    ".parquet": "beforerr.io.parquet",
 }
 
+# `RemoteCache` of remote files, see `set_remote_cache`
+remote_cache = None
+
+
+def _is_upath(file) -> bool:
+    # no object can be a `UPath` if `upath` was not imported yet
+    upath = sys.modules.get("upath")
+    return upath is not None and isinstance(file, upath.UPath)
+
 
 def checkpath(file):
     # Placeholder implementation, replace with actual path checking logic
@@ -29,29 +73,208 @@ def query_datatype(file: str):
 
     See also `os.path.splitext(file)` to get the file extension
     """
+    from intake.readers.datatypes import (
+        recommend,
+        JSONFile,
+        PickleFile,
+        Feather2,
+        Parquet,
+    )
+
     datatypes = recommend(file)
     ext = os.path.splitext(file)[1]
-    if JSONFile in datatypes or ext == ".json":
+    if JSONFile in datatypes or ext in [".json", ".jsonl", ".ndjson"]:
         return JSONFile
-    if Feather2 in datatypes or ext == ".arrow":
+    if Feather2 in datatypes or ext in [".arrow", ".ipc", ".feather"]:
         return Feather2
+    if Parquet in datatypes or ext == ".parquet":
+        return Parquet
     else:
         return PickleFile
 
 
-def applicable_func(datatype, func="load"):
-    libraries = maps[datatype]
-    lib = libraries[0]
+def query_backend(file: str) -> str:
+    """query the backend module of a file
+
+    Registered suffixes are matched first (longest first, e.g. `.pkl.zst` before `.zst`), then the datatype is guessed with `query_datatype`.
+    """
+    parts = os.path.basename(file).lower().split(".")
+    for i in range(1, len(parts)):
+        lib = formats.get("." + ".".join(parts[i:]))
+        if lib is not None:
+            return lib
+    return maps[query_datatype(file).__name__][0]
+
+
+@cache
+def applicable_func(lib: str, func="load"):
     mod = importlib.import_module(lib)
+    if not hasattr(mod, func):
+        raise NotImplementedError(f"`{func}` is not supported by {lib}")
     return getattr(mod, func)
 
 # %% ../../../nbs/03_io.ipynb 3
-@validate_call
-def action(func, file: Path, *args, **kwargs):
-    checkpath(file)
-    dp = query_datatype(file.as_posix())
-    return applicable_func(dp, func)(file, *args, **kwargs)
+def register_format(
+    lib: str,  # module providing `load`/`save` (and optionally `scan`) functions
+    *suffixes: str,  # file suffixes handled by the module, e.g. `".csv"` or `".pkl.zst"`
+):
+    """Register a backend module for files with the given suffixes."""
+    for suffix in suffixes:
+        formats["." + suffix.lower().lstrip(".")] = lib
+
+# %% ../../../nbs/03_io.ipynb 4
+@contextmanager
+def open_replace(file, **kwargs):
+    """
+    Open a temporary file beside `file` for writing, moved over `file` once written.
+
+    `file` is never left partially written, and readers of the previous `file` (e.g. memory maps) keep its data instead of seeing it rewritten in place.
+    """
+    from fsspec.core import url_to_fs
+
+    fs, path = url_to_fs(str(file))
+    directory, name = posixpath.split(path)
+    tmp = posixpath.join(directory, f".{name}.tmp{os.getpid()}-{threading.get_ident()}")
+    try:
+        with fs.open(tmp, "wb", **kwargs) as f:
+            yield f
+        fs.mv(tmp, path)
+    finally:
+        if fs.exists(tmp):
+            fs.rm(tmp)
+
+# %% ../../../nbs/03_io.ipynb 5
+def _nbytes(file: "Path | UPath") -> int:
+    "Size of a local `file`"
+    if not isinstance(file, Path) or not file.exists():
+        return 0
+    return file.stat().st_size
+
+
+def action(func, file: "Path | UPath", *args, **kwargs):
+    with span("io.dispatch", action=func) as record:
+        if not isinstance(file, Path) and not _is_upath(file):
+            if "://" in str(file):
+                # URLs (e.g. `s3://bucket/key`, `memory://file`) are opened with `fsspec`
+                from upath import UPath
+
+                file = UPath(file)
+            else:
+                file = Path(file)
+        checkpath(file)
+        lib = record["backend"] = query_backend(file.as_posix())
+        backend_func = applicable_func(lib, func)
+    if remote_cache is not None and func in ("load", "scan") and is_remote(file):
+        with span("io.fetch", file=str(file)):
+            file = remote_cache.fetch(file)
+    with span(f"io.{func}", file=str(file), backend=lib) as record:
+        result = backend_func(file, *args, **kwargs)
+        if func != "scan" and instrumented():
+            record["bytes"] = _nbytes(file)
+    return result
 
 
 load = partial(action, "load")
 save = partial(action, "save")
+scan = partial(action, "scan")
+
+# %% ../../../nbs/03_io.ipynb 20
+async def aaction(func, file: "Path | UPath", *args, **kwargs):
+    import asyncio
+
+    return await asyncio.to_thread(action, func, file, *args, **kwargs)
+
+
+aload = partial(aaction, "load")
+asave = partial(aaction, "save")
+
+
+async def aload_many(files, concurrency: int = 8, **kwargs) -> list:
+    "Load `files` concurrently with at most `concurrency` reads in flight."
+    import asyncio
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _load(file):
+        async with semaphore:
+            return await aload(file, **kwargs)
+
+    return await asyncio.gather(*map(_load, files))
+
+
+def load_many(files, concurrency: int = 8, **kwargs) -> list:
+    "Load `files` on a pool of `concurrency` threads."
+    with ThreadPoolExecutor(concurrency) as pool:
+        return list(pool.map(partial(load, **kwargs), files))
+
+# %% ../../../nbs/03_io.ipynb 23
+class RemoteCache:
+    """Local whole-file cache of remote `fsspec` files with LRU eviction under `max_bytes`."""
+
+    def __init__(self, directory: Path = None, max_bytes: int | None = 2**32):
+        cache_home = Path(os.getenv("XDG_CACHE_HOME", Path.home() / ".cache"))
+        self.directory = Path(directory or cache_home / "beforerr" / "remote")
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        manifest = self.directory / "manifest.json"
+        self.entries = json.loads(manifest.read_text()) if manifest.is_file() else {}
+
+    def save_manifest(self):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        (self.directory / "manifest.json").write_text(
+            json.dumps(self.entries, indent=1)
+        )
+
+    def evict(self, keep: str = None):
+        if self.max_bytes is None:
+            return
+        size = sum(entry["size"] for entry in self.entries.values())
+        for url in sorted(
+            self.entries, key=lambda url: self.entries[url]["last_access"]
+        ):
+            if size <= self.max_bytes:
+                break
+            if url == keep:
+                continue
+            entry = self.entries.pop(url)
+            shutil.rmtree(self.directory / entry["key"], ignore_errors=True)
+            size -= entry["size"]
+
+    def fetch(self, file: "UPath") -> Path:
+        """Local copy of the remote `file`, downloaded if missing or outdated."""
+        fs, url = file.fs, str(file)
+        ukey = fs.ukey(file.path)
+        key = hashlib.sha256(url.encode()).hexdigest()[:16]
+        local = self.directory / key / file.name
+
+        with self._lock:
+            entry = self.entries.get(url)
+        if entry is not None and entry["ukey"] == ukey and local.exists():
+            self.hits += 1
+        else:
+            self.misses += 1
+            local.parent.mkdir(parents=True, exist_ok=True)
+            tmp = local.with_name(f".tmp{threading.get_ident()}-{local.name}")
+            fs.get_file(file.path, tmp)
+            os.replace(tmp, local)
+            size = local.stat().st_size
+            entry = dict(key=key, ukey=ukey, size=size)
+
+        with self._lock:
+            self.entries[url] = entry | dict(last_access=time.time())
+            self.evict(keep=url)
+            self.save_manifest()
+        return local
+
+
+def set_remote_cache(cache: RemoteCache | None = None):
+    "Cache remote files loaded or scanned through `beforerr.io` in `cache` (disabled with `None`)."
+    global remote_cache
+    remote_cache = cache
+    return cache
+
+
+def is_remote(file) -> bool:
+    return _is_upath(file) and file.protocol not in ("", "file", "local")
@@ -1,9 +1,80 @@
+"""Arrow IPC backend
+
+Uncompressed files are memory-mapped on load, compressed files are read into memory.
+Files are written with `beforerr.io.open_replace`, so that frames mapped from the previous file keep their data.
+"""
+
+import struct
+
 import polars as pl
+from fsspec import open
+
+from beforerr.io import open_replace
+
+MAGIC = b"ARROW1"
+
+
+def _u32(buf: bytes, pos: int) -> int:
+    return struct.unpack_from("<I", buf, pos)[0]
+
+
+def _field(buf: bytes, table: int, i: int) -> int | None:
+    "Position of the field `i` of the flatbuffers table at `table` (None if absent)"
+    vtable = table - struct.unpack_from("<i", buf, table)[0]
+    if 4 + 2 * i >= struct.unpack_from("<H", buf, vtable)[0]:
+        return None
+    offset = struct.unpack_from("<H", buf, vtable + 4 + 2 * i)[0]
+    return table + offset if offset else None
+
+
+def _deref(buf: bytes, pos: int) -> int:
+    return pos + _u32(buf, pos)
+
+
+def is_compressed(file) -> bool:
+    """Whether the record batches of the IPC `file` are compressed, read from the metadata of its first record batch."""
+    with open(str(file), "rb") as f:
+        size = f.seek(0, 2)
+        if size < 10:
+            return False
+        f.seek(size - 10)
+        tail = f.read(10)
+        if tail[4:] != MAGIC:
+            return False
+        length = struct.unpack("<i", tail[:4])[0]
+        f.seek(size - 10 - length)
+        footer = f.read(length)
+        batches = _field(footer, _u32(footer, 0), 3)  # Footer.recordBatches
+        if batches is None or _u32(footer, batches := _deref(footer, batches)) == 0:
+            return False
+        # Block(offset: int64, metaDataLength: int32, bodyLength: int64)
+        offset, meta_length = struct.unpack_from("<qi", footer, batches + 4)
+        f.seek(offset)
+        message = f.read(meta_length)
+
+    # skip the continuation marker (if any) and the metadata length
+    message = message[8:] if message[:4] == b"\xff\xff\xff\xff" else message[4:]
+    header = _field(message, _u32(message, 0), 2)  # Message.header (a RecordBatch)
+    if header is None:
+        return False
+    return (
+        _field(message, _deref(message, header), 3) is not None
+    )  # RecordBatch.compression
+
+
+def load(file, memory_map: bool = None, **kwargs):
+    if memory_map is None:
+        memory_map = not is_compressed(file)
+    if memory_map:
+        # Rechunking would copy the memory-mapped record batches into memory
+        kwargs.setdefault("rechunk", False)
+    return pl.read_ipc(file, memory_map=memory_map, **kwargs)
 
 
-def load(file, **kwargs):
-    return pl.read_ipc(file, **kwargs)
+def scan(file, **kwargs):
+    return pl.scan_ipc(file, **kwargs)
 
 
 def save(file, data: pl.DataFrame, **kwargs):
-    data.write_ipc(file, **kwargs)
+    with open_replace(file) as f:
+        data.write_ipc(f, **kwargs)
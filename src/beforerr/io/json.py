@@ -1,12 +1,83 @@
 from fsspec import open
+from itertools import islice
 import json
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+LINES_SUFFIXES = (".jsonl", ".ndjson")
+
+
+def is_lines(file):
+    return str(file).lower().endswith(LINES_SUFFIXES)
+
+
+def loads(s, **kwargs):
+    """Parse a JSON lines record, with `orjson` if installed.
+
+    Records `orjson` cannot parse (e.g. with `NaN`) fall back to `json`.
+    """
+    if orjson is not None and not kwargs:
+        try:
+            return orjson.loads(s)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(s, **kwargs)
+
+
+def dumps(obj, **kwargs) -> bytes:
+    """Serialize a JSON lines record, with `orjson` if installed.
+
+    Records `orjson` cannot serialize (e.g. with non-string keys) fall back to `json`. Note that `orjson` writes `NaN` as `null`.
+    """
+    if orjson is not None and not kwargs:
+        try:
+            return orjson.dumps(obj)
+        except orjson.JSONEncodeError:
+            pass
+    return json.dumps(obj, **kwargs).encode()
+
+
+def iterload(file, **kwargs):
+    """Iterate over the records of a JSON lines file without reading it at once."""
+    with open(str(file), "rb") as f:
+        for line in f:
+            if line.strip():
+                yield loads(line, **kwargs)
+
 
 def load(file, **kwargs):
-    with open(file, "r") as f:
+    if is_lines(file):
+        import polars as pl
+
+        return pl.read_ndjson(file, **kwargs)
+
+    # plain JSON files are always read and written by `json`, so their format does not depend on `orjson`
+    with open(str(file), "r") as f:
         return json.load(f, **kwargs)
 
 
-def save(file, data, **kwargs):
-    with open(file, "w") as f:
-        json.dump(data, f, **kwargs)
+def scan(file, **kwargs):
+    if not is_lines(file):
+        raise NotImplementedError("Only JSON lines files can be scanned")
+
+    import polars as pl
+
+    return pl.scan_ndjson(file, **kwargs)
+
+
+def save(file, data, batch_size: int = 10_000, **kwargs):
+    if not is_lines(file):
+        with open(str(file), "w") as f:
+            json.dump(data, f, **kwargs)
+        return
+
+    if hasattr(data, "write_ndjson"):  # polars
+        return data.write_ndjson(file)
+
+    records = iter(data)
+    with open(str(file), "wb") as f:
+        while batch := list(islice(records, batch_size)):
+            f.write(b"".join(dumps(record, **kwargs) + b"\n" for record in batch))
@@ -0,0 +1,13 @@
+import polars as pl
+
+
+def load(file, **kwargs):
+    return pl.read_parquet(file, **kwargs)
+
+
+def scan(file, **kwargs):
+    return pl.scan_parquet(file, **kwargs)
+
+
+def save(file, data: pl.DataFrame, **kwargs):
+    data.write_parquet(file, **kwargs)
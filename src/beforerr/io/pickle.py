@@ -1,12 +1,101 @@
+"""Pickle backend
+
+Files are written with protocol 5. Without compression, large buffers (e.g. of NumPy arrays or Arrow tables) are stored out-of-band after the pickle stream, aligned and followed by a footer with their positions, so that a result is always a single file.
+The buffers are read back into writable memory, or memory-mapped with `load(file, memory_map=True)` (the loaded arrays are then read-only). Files are written with `beforerr.io.open_replace`, so existing maps keep the previous data.
+Files without large buffers are plain pickle files. Compressed files (e.g. `.pkl.zst`, `.pkl.lz4`, `.pkl.gz`) keep all buffers in the compressed pickle stream.
+"""
+
 from fsspec import open
+from fsspec.utils import infer_compression
+import json
+import mmap
 import pickle
+import struct
+
+from beforerr.io import open_replace
+
+PROTOCOL = 5
+ALIGNMENT = 64
+MIN_BUFFER_SIZE = 2**16  # smaller buffers are kept in the pickle stream
+MAGIC = b"BFRRBUF1"
+FOOTER = struct.Struct("<Q8s")  # length of the positions of the buffers, magic
+
+
+def _align(pos: int) -> int:
+    return -(-pos // ALIGNMENT) * ALIGNMENT
+
+
+def write_buffers(f, buffers: list[pickle.PickleBuffer]):
+    """Write the buffers aligned after the current position of `f`, followed by the footer with their positions."""
+    pos = f.tell()
+    positions = []
+    for buf in buffers:
+        view = buf.raw()
+        f.write(b"\0" * (_align(pos) - pos))
+        pos = _align(pos)
+        positions.append((pos, view.nbytes))
+        f.write(view)
+        pos += view.nbytes
+    footer = json.dumps(positions).encode()
+    f.write(footer + FOOTER.pack(len(footer), MAGIC))
+
+
+def read_buffers(f, memory_map: bool = False) -> list[memoryview] | None:
+    """Read the buffers written by `write_buffers` at the end of `f` (None if there are none), memory-mapping local files (read-only) if `memory_map`."""
+    size = f.seek(0, 2)
+    if size < FOOTER.size:
+        return None
+    f.seek(size - FOOTER.size)
+    length, magic = FOOTER.unpack(f.read(FOOTER.size))
+    if magic != MAGIC:
+        return None
+    f.seek(size - FOOTER.size - length)
+    positions = json.loads(f.read(length))
+    if not positions:
+        return []
+
+    data = None
+    if memory_map:
+        try:
+            data, start = (
+                memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)),
+                0,
+            )
+        except (AttributeError, OSError, ValueError):
+            pass
+    if data is None:
+        start = positions[0][0]
+        stop = positions[-1][0] + positions[-1][1]
+        data = bytearray(stop - start)
+        f.seek(start)
+        f.readinto(data)
+        data = memoryview(data)
+    return [data[pos - start : pos - start + nbytes] for pos, nbytes in positions]
+
+
+def load(file, memory_map: bool = False, **kwargs):
+    compression = infer_compression(str(file))
+    with open(str(file), "rb", compression=compression) as f:
+        buffers = None
+        if compression is None:
+            buffers = read_buffers(f, memory_map)
+            f.seek(0)
+        return pickle.load(f, buffers=buffers, **kwargs)
+
 
+def save(file, data, protocol: int = PROTOCOL, **kwargs):
+    compression = infer_compression(str(file))
+    buffers = []
 
-def load(file, **kwargs):
-    with open(file, "r") as f:
-        return pickle.load(f, **kwargs)
+    def buffer_callback(buf: pickle.PickleBuffer):
+        if compression is not None or buf.raw().nbytes < MIN_BUFFER_SIZE:
+            return True
+        buffers.append(buf)
 
+    if protocol >= 5:
+        kwargs.setdefault("buffer_callback", buffer_callback)
 
-def save(file, data, **kwargs):
-    with open(file, "wb") as f:
-        pickle.dump(data, f, **kwargs)
+    with open_replace(file, compression=compression) as f:
+        pickle.dump(data, f, protocol=protocol, **kwargs)
+        if buffers:
+            write_buffers(f, buffers)
@@ -3,6 +3,20 @@ from pathlib import Path
 import polars.selectors as cs
 from pydantic import validate_call
 
+SUMMARY = "_summary.parquet"
+
+# `write_parquet` options tuned for time-range scans: row groups of moderate size
+# with statistics, so readers can skip them using the min/max of the `time` column
+PRESETS = {
+    "scan": dict(
+        compression="zstd", compression_level=3, statistics=True, row_group_size=2**17
+    ),
+    "fast": dict(compression="lz4", statistics=True, row_group_size=2**17),
+    "small": dict(
+        compression="zstd", compression_level=12, statistics=True, row_group_size=2**20
+    ),
+}
+
 
 @validate_call(config=dict(arbitrary_types_allowed=True))
 def save(file: Path, data: pl.DataFrame, clean: bool = False, **kwargs):
@@ -22,3 +36,87 @@ def save(file: Path, data: pl.DataFrame, clean: bool = False, **kwargs):
             data.write_parquet(file, **kwargs)
         case _:
             raise ValueError(f"Unsupported format: {format}")
+
+
+def _partition_path(keys: dict) -> str:
+    return "/".join(f"{k}={v}" for k, v in keys.items())
+
+
+@validate_call(config=dict(arbitrary_types_allowed=True))
+def save_dataset(
+    directory: Path,
+    data: pl.DataFrame,
+    partition_by: list[str] = ["date"],
+    col: str = "time",
+    preset: str = "scan",
+    append: bool = True,
+    **kwargs,
+) -> pl.DataFrame:
+    """Write `data` as a hive-style partitioned Parquet dataset.
+
+    A `date` partition column is derived from `col` if it is not in `data`. Each call adds one file per partition (`<key>=<value>/part-<n>.parquet`), or replaces the existing files of the written partitions if `append` is False.
+    A summary file with the rows and the min/max of `col` of every file is updated, so readers can prune files without opening them (see `scan_dataset`).
+    """
+    if "date" in partition_by and "date" not in data.columns:
+        data = data.with_columns(pl.col(col).dt.date().alias("date"))
+    options = PRESETS[preset] | kwargs
+
+    summary_file = directory / SUMMARY
+    summary = pl.read_parquet(summary_file) if summary_file.exists() else None
+
+    records, partitions = [], []
+    for keys, part in data.sort(col).group_by(partition_by, maintain_order=True):
+        keys = dict(zip(partition_by, keys))
+        partitions.append(_partition_path(keys))
+        part_dir = directory / partitions[-1]
+        part_dir.mkdir(parents=True, exist_ok=True)
+        if not append:
+            for file in part_dir.glob("part-*.parquet"):
+                file.unlink()
+        file = (
+            part_dir / f"part-{len(list(part_dir.glob('part-*.parquet'))):05d}.parquet"
+        )
+        part.drop(partition_by).write_parquet(file, **options)
+        records.append(
+            dict(
+                path=file.relative_to(directory).as_posix(),
+                rows=len(part),
+                start=part[col].min(),
+                stop=part[col].max(),
+            )
+        )
+
+    new = pl.DataFrame(records)
+    if summary is not None:
+        if not append:
+            summary = summary.filter(
+                ~pl.col("path").str.extract(r"^(.*)/").is_in(partitions)
+            )
+        new = pl.concat([summary, new], how="vertical_relaxed")
+    new.write_parquet(summary_file)
+    return new
+
+
+def scan_dataset(
+    directory: Path, start=None, stop=None, col: str = "time", **kwargs
+) -> pl.LazyFrame:
+    """Lazily scan the rows of a dataset written by `save_dataset` within `[start, stop]`, opening only the files overlapping the range."""
+    directory = Path(directory)
+    summary = pl.read_parquet(directory / SUMMARY)
+    selected = summary
+    if start is not None:
+        selected = selected.filter(pl.col("stop") >= start)
+    if stop is not None:
+        selected = selected.filter(pl.col("start") <= stop)
+
+    # Keep the schema of the dataset if no file is selected
+    paths = selected["path"] if len(selected) else summary["path"].head(1)
+    files = [(directory / path).as_posix() for path in paths]
+    data = pl.scan_parquet(files, hive_partitioning=True, **kwargs)
+    if not len(selected):
+        return data.clear()
+    if start is not None:
+        data = data.filter(pl.col(col) >= start)
+    if stop is not None:
+        data = data.filter(pl.col(col) <= stop)
+    return data
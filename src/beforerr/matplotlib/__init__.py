@@ -1,45 +1,69 @@
 # AUTOGENERATED! DO NOT EDIT! File to edit: ../../../nbs/11_matplotlib.ipynb.
 
 # %% auto 0
-__all__ = ['PlotObject', 'module_path', 'styles_path', 'stylesheets', 'get_axes', 'func2axes', 'func2lines', 'func2legend',
-           'figsize', 'easy_save', 'unify_axis_fontsize', 'unify_axes_fontsize', 'hide_xlabels', 'hide_ylabels',
-           'create_legends', 'set_linewidth', 'sync_legend_colors', 'hide_legends', 'hide_legend_lines', 'PlotOpts',
-           'process_figure', 'update_rcParams']
+__all__ = ['PlotObject', 'module_path', 'styles_path', 'DECIMATORS', 'load_styles', 'register_styles', 'get_axes', 'func2axes',
+           'func2lines', 'func2legend', 'figsize', 'easy_save', 'rasterize_dense', 'export_figures', 'minmax_indices',
+           'lttb_indices', 'decimate', 'plot_decimated', 'unify_axis_fontsize', 'unify_axes_fontsize', 'hide_xlabels',
+           'hide_ylabels', 'create_legends', 'set_linewidth', 'sync_legend_colors', 'hide_legends', 'hide_legend_lines',
+           'PlotOpts', 'process_figure', 'update_rcParams']
 
 # %% ../../../nbs/11_matplotlib.ipynb 1
+import hashlib
+import inspect
+import json
+import pickle
+import time
+import numpy as np
+import matplotlib
 import matplotlib.pyplot as plt
 from matplotlib.pyplot import Axes, Line2D
 from matplotlib.figure import Figure
 from matplotlib.legend import Legend
 from pydantic import BaseModel
 from typing import Callable
+from contextlib import contextmanager
+from functools import cache
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
 import sys
 import os
 import beforerr.matplotlib as bmpl
-from ..project import plotsdir
+from ..project import atomic_save, plotsdir
 
 # Define the type alias
 PlotObject = Figure | Axes | list[Axes] | None
 
-# %% ../../../nbs/11_matplotlib.ipynb 2
+# %% ../../../nbs/11_matplotlib.ipynb 3
 # | code-summary: Register the bundled stylesheets in the matplotlib style library
 # https://github.com/garrettj403/SciencePlots/blob/master/scienceplots/__init__.py
 module_path = bmpl.__path__[0]
 styles_path = os.path.join(module_path, "styles")
 
-# Reads styles in /styles folder and all subfolders
-stylesheets = {}  # plt.style.library is a dictionary
-for folder, _, _ in os.walk(styles_path):
-    new_stylesheets = plt.style.core.read_style_directory(folder)
-    stylesheets.update(new_stylesheets)
 
-# Update dictionary of styles - plt.style.library
-plt.style.core.update_nested_dict(plt.style.library, stylesheets)
-# Update `plt.style.available`, copy-paste from:
-# https://github.com/matplotlib/matplotlib/blob/a170539a421623bb2967a45a24bb7926e2feb542/lib/matplotlib/style/core.py#L266  # noqa: E501
-plt.style.core.available[:] = sorted(plt.style.library.keys())
+@cache
+def load_styles() -> dict:
+    "Parse the bundled stylesheets (only once)."
+    # Reads styles in /styles folder and all subfolders
+    stylesheets = {}  # plt.style.library is a dictionary
+    for folder, _, _ in os.walk(styles_path):
+        new_stylesheets = plt.style.core.read_style_directory(folder)
+        stylesheets.update(new_stylesheets)
+    return stylesheets
 
-# %% ../../../nbs/11_matplotlib.ipynb 3
+
+def register_styles():
+    "Register the bundled stylesheets in the matplotlib style library."
+    # Update dictionary of styles - plt.style.library
+    plt.style.core.update_nested_dict(plt.style.library, load_styles())
+    # Update `plt.style.available`, copy-paste from:
+    # https://github.com/matplotlib/matplotlib/blob/a170539a421623bb2967a45a24bb7926e2feb542/lib/matplotlib/style/core.py#L266  # noqa: E501
+    plt.style.core.available[:] = sorted(plt.style.library.keys())
+
+
+# Parsing and registering the bundled stylesheets takes about a millisecond, so they are available right after import
+register_styles()
+
+# %% ../../../nbs/11_matplotlib.ipynb 5
 def get_axes(obj: PlotObject):
     if isinstance(obj, Axes):
         return [obj]
@@ -67,7 +91,7 @@ def func2legend(obj: PlotObject, func: Callable, *args, **kwargs):
         legend = ax.get_legend()
         legend and func(legend, *args, **kwargs)
 
-# %% ../../../nbs/11_matplotlib.ipynb 5
+# %% ../../../nbs/11_matplotlib.ipynb 7
 def figsize(col=1, width: float = None, height: float = None, ratio: float = None):
     """Return figure size for a given height and column width for publication.
 
@@ -87,20 +111,238 @@ def figsize(col=1, width: float = None, height: float = None, ratio: float = Non
 
     return width, height
 
-# %% ../../../nbs/11_matplotlib.ipynb 7
-def easy_save(name: str, fig: Figure = None, formats=["svg"], dir=plotsdir(), **kwargs):
+# %% ../../../nbs/11_matplotlib.ipynb 9
+def easy_save(
+    name: str,
+    fig: Figure = None,
+    formats=["svg"],
+    dir=plotsdir(),
+    rasterize: int | None = 10_000,  # see `rasterize_dense`
+    **kwargs,
+):
     fig = fig or plt.gcf()
     path = dir / name
-    return [fig.savefig(path.with_suffix(f".{fmt}"), **kwargs) for fmt in formats]
+    with rasterize_dense(fig, rasterize):
+        return [fig.savefig(path.with_suffix(f".{fmt}"), **kwargs) for fmt in formats]
 
-# %% ../../../nbs/11_matplotlib.ipynb 9
+# %% ../../../nbs/11_matplotlib.ipynb 10
+@contextmanager
+def rasterize_dense(fig: Figure, threshold: int = 10_000):
+    "Temporarily rasterize the lines and collections of `fig` with more than `threshold` points."
+    dense = []
+    for ax in fig.axes if threshold else []:
+        for line in ax.get_lines():
+            len(line.get_xdata()) > threshold and dense.append(line)
+        for collection in ax.collections:
+            size = max(len(collection.get_offsets()), len(collection.get_paths()))
+            size > threshold and dense.append(collection)
+    dense = [artist for artist in dense if not artist.get_rasterized()]
+    for artist in dense:
+        artist.set_rasterized(True)
+    try:
+        yield dense
+    finally:
+        for artist in dense:
+            artist.set_rasterized(False)
+
+# %% ../../../nbs/11_matplotlib.ipynb 12
+def _savefig(file: Path, fig: Figure, **kwargs):
+    return fig.savefig(file, **kwargs)
+
+
+def _inputs_key(figure, formats: list[str], kwargs: dict) -> str | None:
+    "Hash of a figure factory (including the source code of its function) or a pickled figure, and the export options, None if they can not be pickled."
+    try:
+        inputs = pickle.dumps((figure, formats, sorted(kwargs.items())))
+    except (pickle.PicklingError, AttributeError, TypeError):
+        return None
+    digest = hashlib.sha256(inputs)
+    try:
+        digest.update(inspect.getsource(getattr(figure, "func", figure)).encode())
+    except (OSError, TypeError):
+        pass
+    return digest.hexdigest()
+
+
+def _render_figure(
+    figure, path: Path, formats: list[str], rasterize: int | None, kwargs: dict
+) -> float:
+    start = time.perf_counter()
+    fig = pickle.loads(figure) if isinstance(figure, bytes) else figure()
+    with rasterize_dense(fig, rasterize):
+        for fmt in formats:
+            file = path.with_name(f"{path.name}.{fmt}")
+            atomic_save(file, fig, _savefig, format=fmt, **kwargs)
+    plt.close(fig)
+    return time.perf_counter() - start
+
+# %% ../../../nbs/11_matplotlib.ipynb 13
+def export_figures(
+    figures: dict[str, Callable | Figure | bytes],  # name -> figure factory or figure
+    formats=["svg", "pdf", "png"],
+    dir=plotsdir(),
+    max_workers: int = None,  # number of processes, render in this process if 0
+    force: bool = False,  # render even if the inputs did not change
+    rasterize: int | None = 10_000,  # see `rasterize_dense`
+    **kwargs,  # passed to `Figure.savefig`
+) -> dict[str, float | None]:
+    """
+    Render `figures` to `<dir>/<name>.<format>` for every format in parallel.
+
+    Returns the render time (in seconds) of every figure, or None if it was skipped. Figures given as `Figure` objects, or as factories that can not be pickled (e.g. lambdas, which can only be rendered with `max_workers=0`), are always rendered.
+    """
+    dir = Path(dir)
+    dir.mkdir(parents=True, exist_ok=True)
+    manifest = dir / "_figures.json"
+    keys = json.loads(manifest.read_text()) if manifest.exists() else {}
+
+    times, tasks = {}, {}
+    for name, figure in figures.items():
+        if isinstance(figure, Figure):
+            # pickles of the same figure differ, so it can not be compared
+            figure, key = pickle.dumps(figure), None
+        else:
+            key = _inputs_key(figure, formats, kwargs)
+        path = dir / name
+        files = [path.with_name(f"{path.name}.{fmt}") for fmt in formats]
+        unchanged = key is not None and keys.get(name) == key
+        if not force and unchanged and all(f.exists() for f in files):
+            times[name] = None
+        else:
+            tasks[name] = (key, (figure, path, formats, rasterize, kwargs))
+
+    if max_workers == 0:
+        times |= {name: _render_figure(*args) for name, (_, args) in tasks.items()}
+    elif tasks:
+        with ProcessPoolExecutor(
+            max_workers, initializer=matplotlib.use, initargs=("agg",)
+        ) as pool:
+            futures = {
+                name: pool.submit(_render_figure, *args)
+                for name, (_, args) in tasks.items()
+            }
+            times |= {name: future.result() for name, future in futures.items()}
+
+    keys |= {name: key for name, (key, _) in tasks.items()}
+    atomic_save(manifest, keys)
+    return times
+
+# %% ../../../nbs/11_matplotlib.ipynb 16
+def _as_numpy(a) -> np.ndarray:
+    return a.to_numpy() if hasattr(a, "to_numpy") else np.asarray(a)
+
+
+def _numeric(x: np.ndarray) -> np.ndarray:
+    return x.view("int64") if np.issubdtype(x.dtype, np.datetime64) else x
+
+# %% ../../../nbs/11_matplotlib.ipynb 17
+def minmax_indices(x, y, n: int) -> np.ndarray:
+    """
+    Indices of the first and last points, and of the minimum and maximum of `y` in each of `n` equal-width bins of `x` (sorted).
+    """
+    x, y = _numeric(_as_numpy(x)), _as_numpy(y)
+    if len(x) <= 2 * n + 2:
+        return np.arange(len(x))
+    edges = np.searchsorted(x, np.linspace(x[0], x[-1], n + 1)[1:-1])
+    bounds = [0, *edges, len(x)]
+    indices = [0, len(x) - 1]
+    for start, stop in zip(bounds[:-1], bounds[1:]):
+        if stop > start:
+            segment = y[start:stop]
+            indices += [start + segment.argmin(), start + segment.argmax()]
+    return np.unique(indices)
+
+
+def lttb_indices(x, y, n: int) -> np.ndarray:
+    "Indices of the `n` points selected by Largest-Triangle-Three-Buckets."
+    x, y = _numeric(_as_numpy(x)), _as_numpy(y)
+    if len(x) <= n or n < 3:
+        return np.arange(len(x))
+    x, y = x.astype(float), y.astype(float)
+    # first and last points are kept, the others are split into n - 2 buckets
+    bounds = np.linspace(1, len(x) - 1, n - 1).astype(int)
+    indices = np.empty(n, dtype=int)
+    indices[0], indices[-1] = 0, len(x) - 1
+    a = 0
+    for i, (start, stop) in enumerate(zip(bounds[:-1], bounds[1:])):
+        if i == n - 3:
+            cx, cy = x[-1], y[-1]
+        else:
+            cx, cy = x[stop : bounds[i + 2]].mean(), y[stop : bounds[i + 2]].mean()
+        xs, ys = x[start:stop], y[start:stop]
+        area = np.abs((x[a] - cx) * (ys - y[a]) - (x[a] - xs) * (cy - y[a]))
+        a = indices[i + 1] = start + area.argmax()
+    return indices
+
+
+DECIMATORS = {"minmax": minmax_indices, "lttb": lttb_indices}
+
+
+def decimate(x, y, n: int = 1000, method: str = "minmax"):
+    "Decimate `(x, y)` to about `n` pixel columns (`method` is one of `DECIMATORS`)."
+    x, y = _as_numpy(x), _as_numpy(y)
+    indices = DECIMATORS[method](x, y, n if method == "minmax" else 2 * n)
+    return x[indices], y[indices]
+
+# %% ../../../nbs/11_matplotlib.ipynb 18
+def plot_decimated(
+    x,  # x values (sorted), or a (polars) DataFrame
+    y=None,  # y values, or the column(s) to plot if `x` is a DataFrame
+    ax: Axes = None,
+    method: str = "minmax",  # one of `DECIMATORS`
+    col: str = "time",  # x column if `x` is a DataFrame
+    **kwargs,  # passed to `ax.plot`
+) -> list[Line2D]:
+    """
+    Plot large series decimated to the pixel width of `ax`, decimating again on zoom.
+    """
+    ax = ax or plt.gca()
+    if hasattr(x, "columns"):
+        data = x
+        columns = (
+            [y] if isinstance(y, str) else y or [c for c in data.columns if c != col]
+        )
+        return [
+            line
+            for c in columns
+            for line in plot_decimated(
+                data[col], data[c], ax, method, label=c, **kwargs
+            )
+        ]
+
+    x, y = _as_numpy(x), _as_numpy(y)
+    decimator = DECIMATORS[method]
+    factor = 1 if method == "minmax" else 2
+    (line,) = ax.plot(x[:1], y[:1], **kwargs)
+    # x in the units of the axes limits (e.g. days for datetimes)
+    xn = np.asarray(ax.convert_xunits(x), dtype=float)
+
+    def update(ax: Axes, autoscale=False):
+        if autoscale:
+            start, stop = 0, len(xn)
+        else:
+            lo, hi = sorted(ax.get_xlim())
+            start, stop = np.searchsorted(xn, lo), np.searchsorted(xn, hi, "right")
+            # keep one point beyond each limit so that the line reaches the edges
+            start, stop = max(start - 1, 0), min(stop + 1, len(xn))
+        n = max(int(ax.get_window_extent().width), 1) * factor
+        indices = start + decimator(xn[start:stop], y[start:stop], n)
+        line.set_data(x[indices], y[indices])
+
+    update(ax, autoscale=True)
+    ax.relim()
+    ax.autoscale_view()
+    ax.callbacks.connect("xlim_changed", update)
+    return [line]
+
+# %% ../../../nbs/11_matplotlib.ipynb 22
 def unify_axis_fontsize(ax: Axes, fontsize: str | float):
     mainlabels = [ax.title, ax.xaxis.label, ax.yaxis.label]
     ticklabels = ax.get_xticklabels() + ax.get_yticklabels()
     for text in mainlabels + ticklabels:
         text.set_fontsize(fontsize)
 
-# %% ../../../nbs/11_matplotlib.ipynb 10
+# %% ../../../nbs/11_matplotlib.ipynb 23
 def unify_axes_fontsize(
     obj: PlotObject = None,  # a single axis or a list of axes
     fontsize: str
@@ -111,7 +353,7 @@ def unify_axes_fontsize(
     """
     func2axes(obj, unify_axis_fontsize, fontsize)
 
-# %% ../../../nbs/11_matplotlib.ipynb 11
+# %% ../../../nbs/11_matplotlib.ipynb 24
 def _hide_x_axis_label(ax: Axes):
     ax.set_xlabel("")
 
@@ -136,7 +378,7 @@ def _create_legend(ax: Axes, handletextpad=0, handlelength=0, **kwargs):
 def create_legends(obj: PlotObject = None, **kwargs):
     func2axes(obj, _create_legend, **kwargs)
 
-# %% ../../../nbs/11_matplotlib.ipynb 13
+# %% ../../../nbs/11_matplotlib.ipynb 26
 # change line width in all axes
 def _set_linewidth(obj: Line2D, w):
     obj.set_linewidth(w)
@@ -145,7 +387,7 @@ def _set_linewidth(obj: Line2D, w):
 def set_linewidth(w, obj: PlotObject = None):
     func2lines(obj, _set_linewidth, w)
 
-# %% ../../../nbs/11_matplotlib.ipynb 15
+# %% ../../../nbs/11_matplotlib.ipynb 28
 def _sync_legend_colors(legend: Legend):
     for line, text in zip(legend.get_lines(), legend.get_texts()):
         text.set_color(line.get_color())
@@ -176,7 +418,7 @@ def hide_legend_lines(obj: PlotObject = None):
     """Hide legend lines on all axes."""
     func2legend(obj, _hide_legend_lines)
 
-# %% ../../../nbs/11_matplotlib.ipynb 17
+# %% ../../../nbs/11_matplotlib.ipynb 30
 class PlotOpts(BaseModel):
     """Options to apply to a matplotlib object."""
 
@@ -1,11 +1,14 @@
 # AUTOGENERATED! DO NOT EDIT! File to edit: ../../nbs/10_polars.ipynb.
 
 # %% auto 0
-__all__ = ['convert_to_pd_dataframe', 'sort', 'pl_norm', 'decompose_vector', 'format_time', 'filter_series_by_ranges_i',
-           'filter_df_by_ranges']
+__all__ = ['convert_to_pd_dataframe', 'iter_pd_dataframes', 'sort', 'pl_norm', 'decompose_vector', 'format_time', 'VectorExpr',
+           'merge_ranges', 'filter_series_by_ranges_i', 'filter_df_by_ranges', 'filter_lf_by_ranges', 'duration',
+           'resample', 'build_pyramid', 'scan_pyramid']
 
 # %% ../../nbs/10_polars.ipynb 2
 import polars as pl
+from datetime import datetime, timedelta
+from pathlib import Path
 import polars.selectors as cs
 from typing import Collection
 
@@ -26,13 +29,36 @@ def convert_to_pd_dataframe(
     return data
 
 # %% ../../nbs/10_polars.ipynb 6
+def iter_pd_dataframes(
+    df: pl.DataFrame | pl.LazyFrame,
+    batch_size: int = None,  # number of rows per batch
+    max_bytes: int = None,  # approximate size of a batch, if `batch_size` is not given
+    streaming: bool = True,  # collect LazyFrames with the streaming engine
+    zero_copy: bool = True,  # reuse the Arrow buffers of `df` (pandas `ArrowDtype` columns)
+):
+    """
+    Convert a Polars DataFrame or LazyFrame into pandas DataFrames in batches of rows.
+    """
+    if isinstance(df, pl.LazyFrame):
+        df = df.collect(streaming=streaming)
+    elif not isinstance(df, pl.DataFrame):
+        raise TypeError("Input must be a Polars DataFrame or LazyFrame")
+
+    if batch_size is None and max_bytes is not None:
+        row_bytes = df.estimated_size() / max(df.height, 1)
+        batch_size = max(int(max_bytes // max(row_bytes, 1)), 1)
+
+    for batch in df.iter_slices(batch_size or max(df.height, 1)):
+        yield batch.to_pandas(use_pyarrow_extension_array=zero_copy)
+
+# %% ../../nbs/10_polars.ipynb 9
 def sort(df: pl.DataFrame, col="time"):
     if df.get_column(col).is_sorted():
         return df.set_sorted(col)
     else:
         return df.sort(col)
 
-# %% ../../nbs/10_polars.ipynb 7
+# %% ../../nbs/10_polars.ipynb 10
 def expand_collections(*items, exclude_types=(str,)):
     expanded: list = []
     for item in items:
@@ -42,7 +68,7 @@ def expand_collections(*items, exclude_types=(str,)):
             expanded.append(item)
     return expanded
 
-# %% ../../nbs/10_polars.ipynb 9
+# %% ../../nbs/10_polars.ipynb 12
 def pl_norm(*columns: str | pl.Expr) -> pl.Expr:
     """
     Computes the square root of the sum of squares for the given columns.
@@ -57,15 +83,18 @@ def pl_norm(*columns: str | pl.Expr) -> pl.Expr:
     all_columns = [pl.col(c) if isinstance(c, str) else c for c in all_columns]
     return sum(c.pow(2) for c in all_columns).sqrt()
 
-# %% ../../nbs/10_polars.ipynb 10
+# %% ../../nbs/10_polars.ipynb 13
 def decompose_vector(
-    df: pl.DataFrame, vector_col, name=None, suffixes: list = ["_x", "_y", "_z"]
+    df: pl.DataFrame | pl.LazyFrame,
+    vector_col,
+    name=None,
+    suffixes: list = ["_x", "_y", "_z"],
 ):
     """
     Decompose a vector column in a DataFrame into separate columns for each component with custom suffixes.
 
     Parameters:
-    - df (pl.DataFrame): The input DataFrame.
+    - df (pl.DataFrame | pl.LazyFrame): The input DataFrame.
     - vector_col (str): The name of the vector column to decompose.
     - name (str, optional): Base name for the decomposed columns. If None, uses `vector_col` as the base name.
     - suffixes (list, optional): A list of suffixes to use for the decomposed columns.
@@ -78,43 +107,291 @@ def decompose_vector(
     if name is None:
         name = vector_col
 
-    # Determine the maximum length of vectors in the column to handle dynamic vector lengths
-    max_length = df.select(pl.col(vector_col).list.len()).max()[0, 0]
+    dtype = df.collect_schema()[vector_col]
+    if isinstance(dtype, pl.Array):
+        # Fixed-size arrays know their width, no need to scan the data
+        max_length = dtype.size
+        getter = pl.col(vector_col).arr.get
+    else:
+        # Determine the maximum length of vectors in the column to handle dynamic vector lengths
+        max_length = (
+            df.lazy().select(pl.col(vector_col).list.len().max()).collect().item()
+        )
+        getter = pl.col(vector_col).list.get
 
     if suffixes is None or len(suffixes) < max_length:
         if suffixes is None:
             suffixes = []
         # Extend or create the list of suffixes with default values
-        suffixes.extend([f"_{i}" for i in range(len(suffixes), max_length)])
+        suffixes = suffixes + [f"_{i}" for i in range(len(suffixes), max_length)]
 
     # Create column expressions for each element in the vector
     column_expressions = [
-        pl.col(vector_col).list.get(i).alias(name).name.suffix(suffixes[i])
-        for i in range(max_length)
+        getter(i).alias(name).name.suffix(suffixes[i]) for i in range(max_length)
     ]
 
     return df.with_columns(column_expressions)
 
-# %% ../../nbs/10_polars.ipynb 11
+# %% ../../nbs/10_polars.ipynb 14
 def format_time(df: pl.DataFrame | pl.LazyFrame, time_unit="ns"):
     return df.with_columns(
         cs.datetime().dt.cast_time_unit(time_unit),
     )
 
-# %% ../../nbs/10_polars.ipynb 13
+# %% ../../nbs/10_polars.ipynb 16
+def _vec(x: str | pl.Expr) -> pl.Expr:
+    return pl.col(x) if isinstance(x, str) else x
+
+# %% ../../nbs/10_polars.ipynb 17
+@pl.api.register_expr_namespace("vec")
+class VectorExpr:
+    """
+    Vector operations on fixed-size `pl.Array` columns (e.g. `pl.Array(pl.Float64, 3)`).
+
+    Other vectors can be given as column names or expressions.
+    """
+
+    def __init__(self, expr: pl.Expr):
+        self._expr = expr
+
+    def components(self, width: int = 3) -> list[pl.Expr]:
+        "The first `width` components of the vector."
+        return [self._expr.arr.get(i) for i in range(width)]
+
+    def dot(self, other: str | pl.Expr) -> pl.Expr:
+        return (self._expr * _vec(other)).arr.sum()
+
+    def norm(self) -> pl.Expr:
+        return (self._expr * self._expr).arr.sum().sqrt()
+
+    def unit(self) -> pl.Expr:
+        return self._expr / self.norm()
+
+    def proj(self, other: str | pl.Expr) -> pl.Expr:
+        "Scalar projection onto `other`."
+        return self.dot(other) / _vec(other).vec.norm()
+
+    def cross(self, other: str | pl.Expr) -> pl.Expr:
+        "Cross product of 3-vectors."
+        ax, ay, az = self.components()
+        bx, by, bz = _vec(other).vec.components()
+        return pl.concat_arr(ay * bz - az * by, az * bx - ax * bz, ax * by - ay * bx)
+
+    def rotate(self, *axes: str | pl.Expr) -> pl.Expr:
+        "Components in the (per-row) orthonormal frame given by `axes`."
+        return pl.concat_arr(*(self.dot(axis) for axis in axes))
+
+# %% ../../nbs/10_polars.ipynb 21
+def merge_ranges(starts, stops) -> pl.DataFrame:
+    """
+    Merge overlapping (or touching) ranges into sorted, disjoint `start`/`stop` ranges.
+
+    Empty ranges (`stop < start`) are dropped.
+    """
+    group = (pl.col("start") > pl.col("stop").cum_max().shift()).fill_null(True)
+    return (
+        pl.DataFrame({"start": starts, "stop": stops})
+        .filter(pl.col("stop") >= pl.col("start"))
+        .sort("start")
+        .group_by(group.cum_sum().alias("group"), maintain_order=True)
+        .agg(pl.col("start").first(), pl.col("stop").max())
+        .drop("group")
+    )
+
+# %% ../../nbs/10_polars.ipynb 23
+def ranges_index(data: pl.Series, starts: list, stops: list):
+    "Non-empty half-open row index ranges of the sorted `data` falling within each `[start, stop]` range, tagged with the range position."
+    index = pl.DataFrame(
+        {
+            "start": data.search_sorted(pl.Series(starts, dtype=data.dtype)),
+            "stop": data.search_sorted(
+                pl.Series(stops, dtype=data.dtype), side="right"
+            ),
+        }
+    )
+    return index.with_row_index("range").filter(pl.col("stop") > pl.col("start"))
+
+# %% ../../nbs/10_polars.ipynb 24
 def filter_series_by_ranges_i(data: pl.Series, starts: list, stops: list):
-    starts_index = data.search_sorted(starts)
-    ends_index = data.search_sorted(stops, side="right")
+    """
+    Sorted, unique row indices of the sorted `data` falling within any `[start, stop]` range.
 
-    return pl.concat(
-        pl.arange(*range, eager=True) for range in zip(starts_index, ends_index)
-    ).unique()
+    Ranges are merged in index space first, so the cost is `O(m log n)` for the lookups plus the number of selected rows, independent of how much the ranges overlap.
+    """
+    index = ranges_index(data, starts, stops)
+    merged = merge_ranges(index["start"], index["stop"])
+    return merged.select(
+        pl.int_ranges("start", "stop").explode().alias("index")
+    ).to_series()
 
 
-def filter_df_by_ranges(data: pl.DataFrame, starts: list, stops: list, col="time"):
+def filter_df_by_ranges(
+    data: pl.DataFrame | pl.LazyFrame,
+    starts: list,
+    stops: list,
+    col="time",
+    range_id: str = None,  # name of a column holding the position of the matching range
+):
     """
     Filter a DataFrame from ranges
+
+    If `range_id` is given, each selected row is tagged with the position of its range in `starts`/`stops`, and rows falling within overlapping ranges are repeated once per range.
+
+    `LazyFrame`s are filtered with `filter_lf_by_ranges`.
+    """
+
+    if isinstance(data, pl.LazyFrame):
+        return filter_lf_by_ranges(data, starts, stops, col, range_id=range_id)
+
+    if range_id is None:
+        return data[filter_series_by_ranges_i(data[col], starts, stops)]
+
+    index = (
+        ranges_index(data[col], starts, stops)
+        .select(
+            pl.col("range").alias(range_id),
+            pl.int_ranges("start", "stop").alias("index"),
+        )
+        .explode("index")
+        .sort("index", range_id)
+    )
+    return data[index["index"]].with_columns(index[range_id])
+
+# %% ../../nbs/10_polars.ipynb 30
+def filter_lf_by_ranges(
+    data: pl.LazyFrame,
+    starts: list,
+    stops: list,
+    col="time",
+    max_predicates: int = 64,  # maximum number of ranges to push down as separate predicates
+    range_id: str = None,  # name of a column holding the position of the matching range
+) -> pl.LazyFrame:
+    """
+    Filter a LazyFrame sorted by `col` from ranges
+    """
+    dtype = data.collect_schema()[col]
+    ranges = merge_ranges(pl.Series(starts, dtype=dtype), pl.Series(stops, dtype=dtype))
+
+    if ranges.is_empty():
+        data = data.clear()
+    elif len(ranges) <= max_predicates:
+        data = data.filter(
+            pl.any_horizontal(
+                pl.col(col).is_between(start, stop)
+                for start, stop in ranges.iter_rows()
+            )
+        )
+    else:
+        ranges = ranges.rename({"start": "_start", "stop": "_stop"})
+        data = (
+            data.filter(
+                pl.col(col).is_between(ranges["_start"][0], ranges["_stop"].max())
+            )
+            .join_asof(ranges.lazy(), left_on=col, right_on="_start")
+            .filter(pl.col(col) <= pl.col("_stop"))
+            .drop("_start", "_stop")
+        )
+
+    if range_id is None:
+        return data
+
+    # Tag the selected rows with every range containing them, as `filter_df_by_ranges`
+    ranges = pl.LazyFrame(
+        {
+            "_start": pl.Series(starts, dtype=dtype),
+            "_stop": pl.Series(stops, dtype=dtype),
+        }
+    ).with_row_index(range_id)
+    return (
+        data.join_where(
+            ranges, pl.col(col) >= pl.col("_start"), pl.col(col) <= pl.col("_stop")
+        )
+        .drop("_start", "_stop")
+        .sort(col, range_id, maintain_order=True)
+    )
+
+# %% ../../nbs/10_polars.ipynb 36
+def duration(every: str | timedelta) -> timedelta:
+    "Length of a polars duration string (e.g. `1s`, `5m`, `1h`)."
+    if isinstance(every, timedelta):
+        return every
+    start = datetime(2000, 1, 1)
+    return pl.select(pl.lit(start).dt.offset_by(every)).item() - start
+
+
+def resample(
+    df: pl.DataFrame | pl.LazyFrame,
+    every: str | timedelta,  # width of the bins
+    aggs: list[pl.Expr] = None,  # defaults to the mean of the numeric columns
+    col: str = "time",
+    **kwargs,  # passed to `group_by_dynamic`
+):
+    """
+    Resample `df` to bins of width `every`, labelled by their start.
+
+    Eager data is only sorted if `col` is not already sorted. LazyFrames must already be sorted by `col` (e.g. flagged with `set_sorted`), polars raises an `InvalidOperationError` otherwise.
+    Without `group_by`, the result is flagged as sorted by `col`; with `group_by`, it is ordered by group, then by `col`.
+    """
+    group_by = kwargs.get("group_by")
+    if aggs is None:
+        aggs = [cs.numeric().exclude(expand_collections(group_by or [])).mean()]
+    if isinstance(df, pl.DataFrame):
+        df = sort(df, col)
+    resampled = df.group_by_dynamic(col, every=every, **kwargs).agg(aggs)
+    return resampled if group_by else resampled.set_sorted(col)
+
+# %% ../../nbs/10_polars.ipynb 37
+def build_pyramid(
+    directory: Path,
+    data: pl.DataFrame | pl.LazyFrame,
+    levels: list[str] = ["1s", "1m", "1h"],  # cadences to precompute
+    aggs: list[pl.Expr] = None,
+    col: str = "time",
+    preset: str = "scan",  # see `beforerr.io.polars.PRESETS`
+    **kwargs,  # passed to `resample`
+) -> dict[str, Path]:
+    """
+    Resample `data` to every cadence in `levels`, saved as `<directory>/<level>.parquet`.
+
+    As in `resample`, LazyFrames must already be sorted by `col`.
     """
+    from beforerr.io.polars import PRESETS, save
+
+    directory = Path(directory)
+    if isinstance(data, pl.DataFrame):
+        data = sort(data, col)
+
+    files = {}
+    for every in levels:
+        files[every] = directory / f"{every}.parquet"
+        resampled = resample(data, every, aggs, col, **kwargs).lazy().collect()
+        save(files[every], resampled, **PRESETS[preset])
+    return files
 
-    indices_unique = filter_series_by_ranges_i(data[col], starts, stops)
-    return data[indices_unique]
+
+def scan_pyramid(
+    directory: Path,
+    start=None,
+    stop=None,
+    resolution: str | timedelta = None,  # the coarsest acceptable cadence
+    points: int = None,  # alternatively, the number of points wanted in `[start, stop]`
+    col: str = "time",
+) -> pl.LazyFrame:
+    """
+    Lazily scan the coarsest level of a pyramid (see `build_pyramid`) whose cadence is not coarser than `resolution`.
+
+    Without a `resolution` (or if no level is fine enough), the finest level is used.
+    """
+    files = sorted(Path(directory).glob("*.parquet"), key=lambda f: duration(f.stem))
+    if resolution is None and points and start is not None and stop is not None:
+        resolution = (stop - start) / points
+    if resolution is not None:
+        resolution = duration(resolution)
+        files = [f for f in files if duration(f.stem) <= resolution][-1:] or files
+
+    data = pl.scan_parquet(files[0]).set_sorted(col)
+    if start is not None:
+        data = data.filter(pl.col(col) >= start)
+    if stop is not None:
+        data = data.filter(pl.col(col) <= stop)
+    return data
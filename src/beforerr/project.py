@@ -1,19 +1,39 @@
 # AUTOGENERATED! DO NOT EDIT! File to edit: ../../nbs/02_projects.ipynb.
 
 # %% auto 0
-__all__ = ['DEFAULT_ALLOWEDTYPES', 'savename', 'append_prefix_suffix', 'projectdir', 'datadir', 'plotsdir', 'setup_run_dir',
-           'safesave', 'produce_or_load_file', 'produce_or_load']
+__all__ = ['DEFAULT_ALLOWEDTYPES', 'savename', 'SavenameFormatter', 'savenames', 'append_prefix_suffix', 'parse_savename',
+           'projectdir', 'datadir', 'plotsdir', 'build_catalog', 'setup_run_dir', 'atomic_save', 'safesave',
+           'file_lock', 'produce_or_load_file', 'produce_or_load', 'config_hash', 'CacheEntry', 'DiskCache',
+           'MemoryCache', 'produce_or_load_many']
 
 # %% ../../nbs/02_projects.ipynb 1
 import os
-from .io import load, save
+import re
+import shutil
+import datetime
+import sys
+import json
+import time
+import hashlib
+from .core import instrumented, span
+from .io import formats, load, save
 from pathlib import Path
-from pydantic import validate_call
+from pydantic import BaseModel, PrivateAttr
 
 import warnings
-from typing import Callable, Tuple
+from collections import OrderedDict
+from functools import lru_cache
+from copy import deepcopy
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from contextlib import contextmanager
+from typing import Callable, Iterable, Literal, Tuple
 from loguru import logger
-from plum import dispatch
+from plum import Function, dispatch
 
 # %% ../../nbs/02_projects.ipynb 4
 @dispatch
@@ -93,43 +113,148 @@ def savename(
         The generated shorthand name.
     """
 
-    if any(sep in prefix for sep in ["/", "\\"]):
-        warnings.warn(
-            "Path separators in `savename` prefixes may break reproducibility on other OS. "
-            "The recommended way is using `os.path.join` with `savename` (e.g. `os.path.join(datadir, savename(prefix, data))`)."
-        )
-
-    accesses = accesses or list(params.keys())
-    labels = [
-        label
-        for label in accesses
-        if label not in ignores and isinstance(params[label], allowedtypes)
-    ]
-    sort and labels.sort()
-
-    name_parts = [prefix] if prefix else []
-    for label in labels:
-        val = params[label]
-        if label in expand:
-            nested_name = savename(
-                val,
-                connector=",",
-                equals=equals,
-                val2string=val2string,
-                allowedtypes=allowedtypes,
-            )
-            if nested_name:
-                name_parts.append(f"{label}{equals}({nested_name})")
-        else:
-            name_parts.append(f"{label}{equals}{val2string(val)}")
+    options = (
+        prefix,
+        suffix,
+        allowedtypes,
+        None if accesses is None else tuple(accesses),
+        tuple(ignores),
+        connector,
+        equals,
+        tuple(expand),
+        val2string,
+        sort,
+    )
+    try:
+        formatter = _formatter(*options)
+    except TypeError:  # unhashable options
+        formatter = SavenameFormatter(*options)
+    return formatter(params)
 
-    name = connector.join(name_parts)
-    if suffix:
-        name += f".{suffix}"
 
-    return name
+@lru_cache(maxsize=128)
+def _formatter(*options) -> "SavenameFormatter":
+    return SavenameFormatter(*options)
 
 # %% ../../nbs/02_projects.ipynb 8
+class SavenameFormatter:
+    """
+    `savename` with fixed options, compiled for repeated use.
+
+    `SavenameFormatter(**kwargs)(params)` is identical to `savename(params, **kwargs)`, which uses a cached formatter.
+    """
+
+    def __init__(
+        self,
+        prefix: str = "",
+        suffix: str = "",
+        allowedtypes: Tuple = DEFAULT_ALLOWEDTYPES,
+        accesses: list[str] = None,
+        ignores: list[str] = [],
+        connector: str = "_",
+        equals: str = "=",
+        expand: list[str] = [],
+        val2string: Callable = valtostring,
+        sort: bool = True,
+    ):
+        if any(sep in prefix for sep in ["/", "\\"]):
+            warnings.warn(
+                "Path separators in `savename` prefixes may break reproducibility on other OS. "
+                "The recommended way is using `os.path.join` with `savename` (e.g. `os.path.join(datadir, savename(prefix, data))`)."
+            )
+        self.head = [prefix] if prefix else []
+        self.tail = f".{suffix}" if suffix else ""
+        self.allowedtypes = allowedtypes
+        self.accesses = accesses
+        self.ignores = set(ignores)
+        self.connector = connector
+        self.equals = equals
+        self.expand = set(expand)
+        self.val2string = val2string
+        self.sort = sort
+        self.nested = expand and SavenameFormatter(
+            connector=",",
+            equals=equals,
+            val2string=val2string,
+            allowedtypes=allowedtypes,
+        )
+        self._labels = {}  # key set -> [(label, "label=", expanded)]
+        self._converters = {}  # value type -> converter (None if not allowed)
+
+    def labels(self, keys: tuple) -> list[tuple]:
+        if (labels := self._labels.get(keys)) is None:
+            labels = [k for k in self.accesses or keys if k not in self.ignores]
+            self.sort and labels.sort()
+            labels = [(k, f"{k}{self.equals}", k in self.expand) for k in labels]
+            self._labels[keys] = labels
+        return labels
+
+    def converter(self, val):
+        t = type(val)
+        if t not in self._converters:
+            conv = None
+            if isinstance(val, self.allowedtypes):
+                conv = self.val2string
+                if isinstance(conv, Function):
+                    conv, _ = conv.resolve_method((val,))
+            self._converters[t] = conv
+        return self._converters[t]
+
+    def part(self, start: str, expanded: bool, val) -> str | None:
+        if (conv := self.converter(val)) is None:
+            return None
+        if expanded:
+            nested_name = self.nested(val)
+            return f"{start}({nested_name})" if nested_name else None
+        return f"{start}{conv(val)}"
+
+    def __call__(self, params: dict) -> str:
+        get, converter = self._converters.get, self.converter
+        parts = self.head.copy()
+        append = parts.append
+        for label, start, expanded in self.labels(tuple(params)):
+            val = params[label]
+            if (conv := get(type(val)) or converter(val)) is None:
+                continue
+            if expanded:
+                (part := self.part(start, expanded, val)) and append(part)
+            else:
+                append(f"{start}{conv(val)}")
+        return self.connector.join(parts) + self.tail
+
+    def many(self, grid) -> list[str]:
+        "Names for a list of parameter dictionaries or the rows of a (polars) DataFrame."
+        if not hasattr(grid, "get_column"):
+            return list(map(self, grid))
+
+        # Format column by column, so each column is converted with a single converter in the common case
+        columns = []
+        for label, start, expanded in self.labels(tuple(grid.columns)):
+            values = grid.get_column(label).to_list()
+            if not values:
+                continue
+            single = len(set(map(type, values))) == 1
+            conv = self.converter(values[0]) if single else None
+            if conv is not None and not expanded:
+                columns.append([f"{start}{conv(v)}" for v in values])
+            elif not single or conv is not None:
+                columns.append([self.part(start, expanded, v) for v in values])
+
+        rows = zip(*columns) if columns else ([] for _ in range(grid.height))
+        if any(None in column for column in columns):
+            rows = ([p for p in row if p is not None] for row in rows)
+        return [self.connector.join(self.head + list(row)) + self.tail for row in rows]
+
+
+def savenames(grid, **kwargs) -> list[str]:
+    """
+    Create names for every configuration in `grid` (a list of dictionaries or a DataFrame).
+
+    Same as `[savename(params, **kwargs) for params in grid]`, but much faster for large grids.
+    """
+    return SavenameFormatter(**kwargs).many(grid)
+
+# %% ../../nbs/02_projects.ipynb 12
 def append_prefix_suffix(name: str, prefix: str, suffix: str):
     if prefix:
         name = f"{prefix}_{name}"
@@ -137,7 +262,93 @@ def append_prefix_suffix(name: str, prefix: str, suffix: str):
         name = f"{name}.{suffix}"
     return name
 
-# %% ../../nbs/02_projects.ipynb 10
+# %% ../../nbs/02_projects.ipynb 13
+def stringtoval(s: str, connector: str = ",", equals: str = "="):
+    "Inverse of `valtostring` for the types allowed by default."
+    if s.startswith("(") and s.endswith(")"):
+        return parse_savename(s[1:-1], connector=connector, equals=equals, suffix="")
+    if s in ("True", "False"):
+        return s == "True"
+    for cast in (int, float):
+        try:
+            return cast(s)
+        except ValueError:
+            pass
+    return s
+
+# %% ../../nbs/02_projects.ipynb 14
+def parse_savename(
+    name: str,
+    prefix: str = "",
+    suffix: str = None,
+    connector: str = "_",
+    equals: str = "=",
+    keys: list[str] = None,
+) -> dict:
+    """
+    Parse a name created by `savename` back into a dictionary of parameters.
+
+    Parameters
+    ----------
+    name : str
+        The name (or file name) to parse.
+    prefix : str, optional
+        The prefix the name starts with.
+    suffix : str, optional
+        The suffix the name ends with. By default, a registered file suffix (see `beforerr.io.register_format`) is removed.
+    connector : str, optional
+        String used to connect key-value pairs.
+    equals : str, optional
+        Connector between key and value.
+    keys : list[str], optional
+        Known keys. Without them, parts without `equals` are considered part of the following key (e.g. `n_steps=5`), or of the value for the last key (e.g. `mode=double_precision`).
+
+    Returns
+    -------
+    dict
+        The parsed parameters, with values converted back to `int`, `float`, `bool` or nested dictionaries where possible.
+    """
+    if suffix is None:
+        lower = name.lower()
+        for ext in sorted(formats, key=len, reverse=True):
+            if lower.endswith(ext):
+                name = name[: -len(ext)]
+                break
+    elif suffix:
+        name = name.removesuffix(f".{suffix}")
+    if prefix:
+        name = name.removeprefix(f"{prefix}{connector}")
+
+    if keys is not None:
+        pattern = "|".join(re.escape(k) for k in sorted(keys, key=len, reverse=True))
+        regex = rf"(?:^|{re.escape(connector)})({pattern}){re.escape(equals)}"
+        matches = list(re.finditer(regex, name))
+        ends = [m.start() for m in matches[1:]] + [len(name)]
+        pairs = [(m[1], name[m.end() : end]) for m, end in zip(matches, ends)]
+    else:
+        # Split on the connectors outside of (nested) parentheses
+        parts, depth, start = [], 0, 0
+        for i, char in enumerate(name):
+            depth += (char == "(") - (char == ")")
+            if depth == 0 and name.startswith(connector, i):
+                parts.append(name[start:i])
+                start = i + len(connector)
+        parts.append(name[start:])
+
+        pairs, pending = [], []
+        for i, part in enumerate(parts):
+            if equals in part:
+                key, value = part.split(equals, 1)
+                pairs.append([connector.join(pending + [key]), value])
+                pending = []
+            elif pairs and i == len(parts) - 1:
+                pairs[-1][1] += connector + part
+            else:
+                pending.append(part)
+
+    return {k: stringtoval(v, ",", equals) for k, v in pairs}
+
+# %% ../../nbs/02_projects.ipynb 17
 def projectdir():
     try:
         path = Path(os.getenv("PIXI_PROJECT_ROOT"))
@@ -153,7 +364,73 @@ def datadir(subdir="data"):
 def plotsdir(subdir="figures"):
     return projectdir() / subdir
 
-# %% ../../nbs/02_projects.ipynb 11
+# %% ../../nbs/02_projects.ipynb 19
+def _dir_kwargs(info: dict, kwargs: dict) -> dict:
+    "Directory names have no suffix to remove"
+    return kwargs | dict(suffix="") if info["is_dir"] else kwargs
+
+
+def build_catalog(
+    directory: Path = None,  # defaults to `datadir()`
+    file: Path = None,  # defaults to `<directory>/_catalog.parquet`
+    recursive: bool = True,
+    **kwargs,  # passed to `parse_savename`
+):
+    """
+    Build (or update) the catalog of the results in `directory`.
+    """
+    import polars as pl
+
+    directory = Path(directory or datadir())
+    file = Path(file or directory / "_catalog.parquet")
+
+    previous = {}
+    if file.exists():
+        for (parent,), rows in pl.read_parquet(file).group_by("parent"):
+            previous[parent] = rows
+
+    catalog = []
+
+    def visit(path: Path, config: dict):
+        mtime = path.stat().st_mtime_ns
+        rows = previous.get(str(path))
+        if rows is not None and rows["parent_mtime"][0] == mtime:
+            rows = rows.to_dicts()
+        else:
+            rows = []
+            for entry in os.scandir(path):
+                if entry.name.startswith((".", "_")) or entry.name.endswith(".lock"):
+                    continue
+                stat = entry.stat()
+                info = dict(
+                    path=entry.path,
+                    parent=str(path),
+                    parent_mtime=mtime,
+                    is_dir=entry.is_dir(),
+                    size=stat.st_size,
+                    mtime=datetime.datetime.fromtimestamp(stat.st_mtime),
+                )
+                params = parse_savename(entry.name, **_dir_kwargs(info, kwargs))
+                rows.append(config | params | info)
+        catalog.extend(rows)
+
+        if recursive:
+            for row in rows:
+                if row["is_dir"]:
+                    name = Path(row["path"]).name
+                    params = parse_savename(name, **_dir_kwargs(row, kwargs))
+                    visit(Path(row["path"]), config | params)
+
+    visit(directory, {})
+    catalog = pl.DataFrame(catalog, infer_schema_length=None, strict=False)
+    if catalog.is_empty():
+        # a catalog without columns could not be read back
+        file.unlink(missing_ok=True)
+    else:
+        catalog.write_parquet(file)
+    return catalog
+
+# %% ../../nbs/02_projects.ipynb 21
 def setup_run_dir(
     c: dict, base_dir: Callable = datadir, change_dir: bool = True, **kwargs
 ):
@@ -181,28 +458,134 @@ def setup_run_dir(
         os.chdir(directory)
         logger.info(f"Changed directory to {directory}")
 
-# %% ../../nbs/02_projects.ipynb 13
-@validate_call
-def increment_backup_num(filepath: Path):
-    if "_" in filepath.stem and filepath.stem.rsplit("_", 1)[-1].isdigit():
-        base, num = filepath.stem.rsplit("_", 1)
-        new_num = int(num) + 1
-    else:
-        base, new_num = filepath.stem, 1
-    return filepath.with_name(f"{base}_{new_num}{filepath.suffix}")
+# %% ../../nbs/02_projects.ipynb 23
+def move(src: Path, dst: Path, link: bool = False):
+    "Move (or hard link, falling back to copying) `src` to `dst`."
+    if not link:
+        os.replace(src, dst)
+        return
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
 
-# %% ../../nbs/02_projects.ipynb 14
-def safesave(file: str, data, save_func: Callable = save):
+
+def fsync(path: Path):
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def backups(path: Path) -> dict[int, Path]:
+    "Existing backups `<stem>_<n><suffix>` of `path`, found with a single directory listing."
+    pattern = re.compile(rf"{re.escape(path.stem)}_(\d+){re.escape(path.suffix)}")
+    names = os.listdir(path.parent) if path.parent.is_dir() else []
+    return {
+        int(m[1]): path.with_name(name)
+        for name in names
+        if (m := pattern.fullmatch(name))
+    }
+
+# %% ../../nbs/02_projects.ipynb 24
+def atomic_save(file: str, data, save_func: Callable = save, **kwargs):
+    """
+    Save `data` to a temporary file in the same directory, flush it to disk and rename it to `file`, so that `file` is either the old or the complete new version, even if the process crashes.
+
+    `save_func` must write a single file, as the built-in formats do.
+    """
+    path = Path(file)
+    tmp = path.with_name(f".tmp{os.getpid()}-{path.name}")
+    try:
+        result = save_func(tmp, data, **kwargs)
+        fsync(tmp)
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
+    if os.name == "posix":
+        fsync(path.parent)
+    return result
+
+
+def safesave(
+    file: str,
+    data,
+    save_func: Callable = save,
+    keep: int = None,  # maximum number of backups to keep (none with 0), all by default
+    atomic: bool = True,  # write with `atomic_save`
+    **kwargs,
+):
+    """
+    Save `data` to `file`, keeping the previous version as a numbered backup `<stem>_<n><suffix>`.
+    """
     path = Path(file)
 
     if path.exists():
-        backup_path = increment_backup_num(path)
-        while backup_path.exists():
-            backup_path = increment_backup_num(backup_path)
-        path.fs.mv(path, backup_path)
-    return save_func(path, data)
+        existing = backups(path)
+        if keep != 0:
+            num = max(existing, default=0) + 1
+            # With atomic saves, `path` is replaced in one step, so the old version can be linked
+            move(path, path.with_name(f"{path.stem}_{num}{path.suffix}"), link=atomic)
+
+        if keep is not None:
+            for n in sorted(existing)[: max(len(existing) + 1 - keep, 0)]:
+                existing[n].unlink()
+
+    if atomic:
+        return atomic_save(path, data, save_func, **kwargs)
+    return save_func(path, data, **kwargs)
+
+# %% ../../nbs/02_projects.ipynb 27
+@contextmanager
+def file_lock(file: Path):
+    """
+    Exclusive inter-process lock on `file`, held through a sibling `.lock` file removed on release.
+
+    Uses `fcntl.flock` on POSIX systems and `msvcrt.locking` on Windows.
+    """
+    lock = file.with_name(f"{file.name}.lock")
+    lock.parent.mkdir(parents=True, exist_ok=True)
+
+    if os.name == "nt":
+        import msvcrt
+
+        with open(lock, "w") as fd:
+            while True:
+                try:
+                    msvcrt.locking(fd.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:  # still locked after retrying for 10 seconds
+                    pass
+            try:
+                yield
+            finally:
+                msvcrt.locking(fd.fileno(), msvcrt.LK_UNLCK, 1)
+        try:
+            lock.unlink()
+        except OSError:  # open by a process waiting for the lock
+            pass
+        return
+
+    import fcntl
+
+    while True:
+        fd = open(lock, "w")
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        # the previous holder may have removed the lock file while we were waiting
+        try:
+            if os.fstat(fd.fileno()).st_ino == os.stat(lock).st_ino:
+                break
+        except FileNotFoundError:
+            pass
+        fd.close()
+    try:
+        yield
+    finally:
+        lock.unlink(missing_ok=True)
+        fd.close()
 
-# %% ../../nbs/02_projects.ipynb 16
+# %% ../../nbs/02_projects.ipynb 28
 def produce_or_load_file(
     f: Callable,
     config: dict,
@@ -211,22 +594,41 @@ def produce_or_load_file(
     verbose: bool = True,
     load_func: Callable = load,
     save_func: Callable = save,
+    memory: "MemoryCache" = None,  # in-process cache of loaded results
+    lock: bool = False,  # hold an inter-process lock on `file` while checking and producing it
     **kwargs,
 ):
+    if lock:
+        with file_lock(file):
+            return produce_or_load_file(
+                f, config, file, force, verbose, load_func, save_func, memory, **kwargs
+            )
+
     exist = file.is_file()
-    if not force and exist:
-        data = load_func(file, **kwargs)
-        return data, file
-    else:
+    hit = not force and exist
+    with span("project.produce_or_load", file=str(file), hit=hit):
+        if hit:
+            if memory is not None:
+                data = memory.load(file, load_func, **kwargs)
+            else:
+                data = load_func(file, **kwargs)
+            return data, file
+
         if verbose:
             force and print(f"Producing file {file} now...")
             not exist and print(f"File {file} does not exist. Producing it now...")
 
-        data = f(**config)
+        func = getattr(f, "__qualname__", repr(f))
+        with span("project.produce", profile=True, func=func):
+            data = f(**config)
 
         try:
-            save_func(file, data, **kwargs)
+            with span("project.save", file=str(file)) as record:
+                save_func(file, data, **kwargs)
+                if instrumented():
+                    record["bytes"] = file.stat().st_size
             verbose and print(f"File {file} saved.")
+            memory is not None and memory.put(file, data)
         except Exception as e:
             print(f"Could not save file. Error: {e}")
 
@@ -243,8 +645,15 @@ def produce_or_load(
     verbose: bool = True,
     action_kwargs: dict = {},
     filename: Callable | str | None = None,
+    cache: "DiskCache" = None,  # store the result in a content-addressed cache instead of `path`
+    memory: "MemoryCache" = None,  # in-process cache of loaded results
     **kwargs,
 ):
+    if cache is not None:
+        return cache.produce_or_load(
+            f, config, suffix, force, verbose, memory=memory, **action_kwargs
+        )
+
     if filename is None:
         name = savename(config, **kwargs)
     elif callable(filename):
@@ -258,4 +667,295 @@ def produce_or_load(
 
     file = path / name
 
-    return produce_or_load_file(f, config, file, force, verbose, **action_kwargs)
+    return produce_or_load_file(
+        f, config, file, force, verbose, memory=memory, **action_kwargs
+    )
+
+# %% ../../nbs/02_projects.ipynb 32
+def _qualname(f: Callable) -> str:
+    "Qualified name of `f`, raising a `TypeError` for lambdas and local functions, whose names are not unique"
+    if "<lambda>" in f.__qualname__ or "<locals>" in f.__qualname__:
+        raise TypeError(
+            f"Cannot hash {f.__qualname__}: define it at the top level of a module"
+        )
+    return f"{f.__module__}.{f.__qualname__}"
+
+
+def _hashable(val):
+    "JSON representation of config values that are stable across processes"
+    if callable(val) and hasattr(val, "__qualname__"):
+        return _qualname(val)
+    if isinstance(val, (Path, datetime.date, datetime.time, datetime.timedelta)):
+        return str(val)
+    raise TypeError(f"Cannot hash {type(val).__name__} values of the config: {val!r}")
+
+
+def config_hash(f: Callable, config: dict, length: int = 16) -> str:
+    """
+    Stable hash of the `config` and the producer function `f`.
+
+    `f` and functions in the config are hashed by their qualified name. Raises a `TypeError` for lambdas and local functions (closures over different values share a name) and for values without a stable representation (other than JSON types, paths and dates).
+    """
+    content = json.dumps(
+        {"func": _qualname(f), "config": config},
+        sort_keys=True,
+        default=_hashable,
+    )
+    return hashlib.sha256(content.encode()).hexdigest()[:length]
+
+
+class CacheEntry(BaseModel):
+    """Manifest record of a cached result."""
+
+    file: str
+    name: str = ""
+    size: int = 0
+    cost: float = 0.0  # time in seconds to produce and save the result
+    last_access: float = 0.0
+    hits: int = 0
+
+
+class DiskCache(BaseModel):
+    """Content-addressed on-disk cache of `produce_or_load` results."""
+
+    directory: Path = datadir("cache")
+    max_bytes: int | None = None
+    policy: Literal["lru", "cost"] = "lru"
+    hits: int = 0
+    misses: int = 0
+    entries: dict[str, CacheEntry] = {}
+
+    def model_post_init(self, __context):
+        if self.manifest.is_file():
+            manifest = json.loads(self.manifest.read_text())
+            self.entries = {k: CacheEntry(**v) for k, v in manifest.items()}
+        return super().model_post_init(__context)
+
+    @property
+    def manifest(self) -> Path:
+        return self.directory / "manifest.json"
+
+    @property
+    def size(self) -> int:
+        return sum(entry.size for entry in self.entries.values())
+
+    def save_manifest(self):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        manifest = {k: v.model_dump() for k, v in self.entries.items()}
+        atomic_save(self.manifest, manifest, indent=1)
+
+    def stats(self) -> dict:
+        return dict(
+            hits=self.hits,
+            misses=self.misses,
+            entries=len(self.entries),
+            size=self.size,
+        )
+
+    def evict(self, keep: str = None):
+        """Remove entries until the cache fits in `max_bytes`, never removing `keep`."""
+        if self.max_bytes is None:
+            return
+
+        def priority(key):
+            entry = self.entries[key]
+            if self.policy == "cost":
+                return (entry.cost / max(entry.size, 1), entry.last_access)
+            return entry.last_access
+
+        size = self.size
+        for key in sorted(self.entries, key=priority):
+            if size <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            entry = self.entries.pop(key)
+            Path(entry.file).unlink(missing_ok=True)
+            size -= entry.size
+
+    def produce_or_load(
+        self,
+        f: Callable,
+        config: dict = dict(),
+        suffix: str = "pickle",
+        force: bool = False,
+        verbose: bool = True,
+        **kwargs,
+    ):
+        key = config_hash(f, config)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        file = self.directory / append_prefix_suffix(key, None, suffix)
+        hit = not force and file.is_file()
+
+        start = time.perf_counter()
+        data, file = produce_or_load_file(f, config, file, force, verbose, **kwargs)
+        now = time.time()
+
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+
+        entry = self.entries.get(key)
+        if hit and entry is not None:
+            entry.hits += 1
+            entry.last_access = now
+        elif file.is_file():  # not if saving failed
+            self.entries[key] = CacheEntry(
+                file=str(file),
+                name=savename(config),
+                size=file.stat().st_size,
+                cost=0.0 if hit else time.perf_counter() - start,
+                last_access=now,
+            )
+
+        self.evict(keep=key)
+        self.save_manifest()
+        return data, file
+
+# %% ../../nbs/02_projects.ipynb 36
+def sizeof(data, seen: set = None) -> int:
+    "Approximate in-memory size of `data` in bytes, including the items of containers."
+    seen = set() if seen is None else seen
+    if id(data) in seen:
+        return 0
+    seen.add(id(data))
+    if hasattr(data, "estimated_size"):  # polars
+        return data.estimated_size()
+    if hasattr(data, "nbytes"):  # pyarrow, numpy
+        return data.nbytes
+    size = sys.getsizeof(data)
+    if isinstance(data, dict):
+        size += sum(sizeof(k, seen) + sizeof(v, seen) for k, v in data.items())
+    elif isinstance(data, (list, tuple, set, frozenset)):
+        size += sum(sizeof(item, seen) for item in data)
+    return size
+
+
+def share(data, copy: bool = True):
+    "Zero-copy view of polars and pyarrow objects, a deep copy of other objects if `copy`."
+    library = type(data).__module__.partition(".")[0]
+    if library == "polars":
+        return data.clone()
+    if library == "pyarrow" or not copy:
+        return data
+    return deepcopy(data)
+
+# %% ../../nbs/02_projects.ipynb 37
+class MemoryCache(BaseModel):
+    """In-process LRU cache of loaded results, keyed by resolved file path and modification time."""
+
+    max_bytes: int = 2**30
+    copy_results: bool = (
+        True  # deep-copy mutable results (other than polars and pyarrow objects)
+    )
+    hits: int = 0
+    misses: int = 0
+    _entries: OrderedDict = PrivateAttr(default_factory=OrderedDict)
+
+    @property
+    def size(self) -> int:
+        return sum(size for _, _, size in self._entries.values())
+
+    def stats(self) -> dict:
+        return dict(
+            hits=self.hits,
+            misses=self.misses,
+            entries=len(self._entries),
+            size=self.size,
+        )
+
+    def clear(self):
+        self._entries.clear()
+
+    def put(self, file: Path, data):
+        key = str(Path(file).resolve())
+        self._entries.pop(key, None)
+        size = sizeof(data)
+        if size > self.max_bytes:
+            return
+        self._entries[key] = (
+            Path(file).stat().st_mtime_ns,
+            share(data, self.copy_results),
+            size,
+        )
+
+        total = self.size
+        while total > self.max_bytes:
+            _, (_, _, evicted) = self._entries.popitem(last=False)
+            total -= evicted
+
+    def load(self, file: Path, load_func: Callable = load, **kwargs):
+        key = str(Path(file).resolve())
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == Path(file).stat().st_mtime_ns:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return share(entry[1], self.copy_results)
+
+        self.misses += 1
+        data = load_func(file, **kwargs)
+        self.put(file, data)
+        return data
+
+# %% ../../nbs/02_projects.ipynb 40
+def _produce_or_load_task(f, config, return_data, action_kwargs, kwargs):
+    data, file = produce_or_load(
+        f, config, action_kwargs=action_kwargs | dict(lock=True), **kwargs
+    )
+    return (data, file) if return_data else file
+
+# %% ../../nbs/02_projects.ipynb 41
+def produce_or_load_many(
+    f: Callable,
+    configs: Iterable[dict],
+    executor: Literal["process", "thread"] = "process",
+    max_workers: int = None,
+    max_pending: int = None,  # maximum number of unfinished configs, defaults to twice the number of workers
+    return_data: bool = True,  # return `(data, file)` pairs, otherwise only the files
+    progress: bool = True,
+    action_kwargs: dict = {},
+    **kwargs,  # passed to `produce_or_load`
+) -> list:
+    """
+    Produce or load the results for all `configs` in parallel.
+
+    Raises a `ValueError` if a `cache` is given, as a `DiskCache` cannot be shared by the workers.
+    """
+    from rich.progress import Progress
+
+    if kwargs.get("cache") is not None:
+        raise ValueError("`cache` is not supported by `produce_or_load_many`")
+
+    configs = list(configs)
+    results = [None] * len(configs)
+    max_workers = max_workers or os.cpu_count()
+    max_pending = max_pending or 2 * max_workers
+    Executor = ProcessPoolExecutor if executor == "process" else ThreadPoolExecutor
+
+    with Executor(max_workers) as pool, Progress(disable=not progress) as bar:
+        task = bar.add_task("produce_or_load", total=len(configs))
+        pending = {}
+
+        def collect():
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                results[pending.pop(future)] = future.result()
+                bar.advance(task)
+
+        try:
+            for i, config in enumerate(configs):
+                if len(pending) >= max_pending:
+                    collect()
+                future = pool.submit(
+                    _produce_or_load_task, f, config, return_data, action_kwargs, kwargs
+                )
+                pending[future] = i
+            while pending:
+                collect()
+        except BaseException:
+            for future in pending:
+                future.cancel()
+            raise
+
+    return results
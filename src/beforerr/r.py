@@ -1,28 +1,85 @@
 # AUTOGENERATED! DO NOT EDIT! File to edit: ../../nbs/12_r.ipynb.
 
 # %% auto 0
-__all__ = ['py2rpy_polars']
+__all__ = ['polars_to_r', 'r_to_polars', 'py2rpy_polars']
 
 # %% ../../nbs/12_r.ipynb 3
-import rpy2
-import rpy2_arrow.arrow as pyra
-from rpy2.robjects.packages import importr
 import polars as pl
+from functools import cache
 
-# %% ../../nbs/12_r.ipynb 4
-def py2rpy_polars():
+# %% ../../nbs/12_r.ipynb 5
+@cache
+def _rarrow():
+    from rpy2.robjects.packages import importr
+
+    return importr("arrow")
+
+
+def polars_to_r(
+    df: pl.DataFrame,
+    max_chunksize: int = 2**20,  # maximum number of rows per record batch
+):
+    """
+    Share `df` with R as an `arrow::Table` through the Arrow C stream interface.
+
+    The data is not copied: the R Table references the buffers of `df`, streamed as record batches of at most `max_chunksize` rows.
+    """
+    import pyarrow as pa
+    import rpy2.robjects as ro
+    import rpy2_arrow.arrow as pyra
+
+    table = df.to_arrow()
+    batches = table.to_batches(max_chunksize)
+    reader = pa.RecordBatchReader.from_batches(table.schema, batches)
+    with ro.default_converter.context():
+        r_reader = pyra.pyarrow_to_r_recordbatchreader(reader)
+        return _rarrow().as_arrow_table(r_reader)
+
+
+def r_to_polars(obj) -> pl.DataFrame:
+    """
+    Convert an R `arrow` object (`Table`, `RecordBatchReader`, `Dataset`, ...) or a `data.frame` to a polars DataFrame through the Arrow C stream interface.
+
+    The buffers of Arrow objects are shared, only `data.frame`s are converted (by R `arrow`).
+    """
+    import rpy2.robjects as ro
+    import rpy2_arrow.arrow as pyra
+
+    with ro.default_converter.context():
+        r_reader = _rarrow().as_record_batch_reader(obj)
+        reader = pyra.rarrow_to_py_recordbatchreader(r_reader)
+    return pl.from_arrow(reader.read_all(), rechunk=False)
+
+# %% ../../nbs/12_r.ipynb 6
+def py2rpy_polars(
+    data_frame: bool = True,  # convert to R `data.frame`s (copying the data), or keep `arrow` Tables (not supported by e.g. `ggplot2`)
+    max_chunksize: int = 2**20,  # see `polars_to_r`
+):
     "Helper functions to convert between `polars` and `R` dataframes"
+    import rpy2.ipython.rmagic
+    import rpy2.rinterface as ri
+    import rpy2.robjects as ro
+    import rpy2_arrow.arrow as pyra
+    from rpy2.robjects.packages import importr
+
     base = importr("base")
 
     conv_pl = rpy2.robjects.conversion.Converter(
-        "Polars to pyarrow", template=pyra.converter
+        "Polars to arrow", template=pyra.converter
     )
 
     @conv_pl.py2rpy.register(pl.DataFrame)
-    def py2rpy_pandas(dataf: pl.DataFrame):
-        pa_tbl = dataf.to_arrow()
-        return base.as_data_frame(pa_tbl)
-        # return pyra.converter.py2rpy(pa_tbl) # NOTE: not working for ggplot2
+    def py2rpy_polars_df(dataf: pl.DataFrame):
+        table = polars_to_r(dataf, max_chunksize)
+        if not data_frame:
+            return table
+        with ro.default_converter.context():
+            return base.as_data_frame(table)
+
+    # R `arrow` Tables (and readers) are converted back to polars DataFrames
+    conv_pl.rpy2py_nc_map[ri.SexpEnvironment].update(
+        {"Table": r_to_polars, "RecordBatchReader": r_to_polars}
+    )
 
     conv_pl = rpy2.ipython.rmagic.converter + conv_pl
     return conv_pl